@@ -1,15 +1,24 @@
-import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.io as pio
+
+from amortization import monthly_payment, portfolio_exposure, total_interest
+from credit_scoring import encode_categoricals, score_frame, segment_mapping
+from credit_store import iter_credit_batches, load_credit_data
+from segment_plots import segment_scatter
+from segment_table import load_segment_table
+from streaming_stats import NUMERIC_COLUMNS, summarize_frames
 pio.templates.default = "plotly_white"
 
-data = pd.read_csv("credit_scoring.csv")
+# Columnar copy of credit_scoring.csv (built on first use): categorical text, narrow numbers
+data = load_credit_data("credit_scoring.csv")
 print(data.head())
 
 print(data.info())
 
-print(data.describe())
+# Summary statistics in one pass over batches of the columnar copy (works for files larger than memory)
+summary = summarize_frames(iter_credit_batches("credit_scoring.csv", NUMERIC_COLUMNS))
+print(summary.describe())
 
 credit_utilization_fig = px.box(data, y='Credit Utilization Ratio',
                                 title='Credit Utilization Ratio Distribution')
@@ -20,39 +29,19 @@ loan_amount_fig = px.histogram(data, x='Loan Amount',
                                title='Loan Amount Distribution')
 loan_amount_fig.show()
 
-numeric_df = data[['Credit Utilization Ratio', 
-                   'Payment History', 
-                   'Number of Credit Accounts', 
-                   'Loan Amount', 'Interest Rate', 
-                   'Loan Term']]
-correlation_fig = px.imshow(numeric_df.corr(), 
+correlation_fig = px.imshow(summary.corr(['Credit Utilization Ratio',
+                                          'Payment History',
+                                          'Number of Credit Accounts',
+                                          'Loan Amount', 'Interest Rate',
+                                          'Loan Term']),
                             title='Correlation Heatmap')
 correlation_fig.show()
 
-# Define the mapping for categorical features
-education_level_mapping = {'High School': 1, 'Bachelor': 2, 'Master': 3, 'PhD': 4}
-employment_status_mapping = {'Unemployed': 0, 'Employed': 1, 'Self-Employed': 2}
-
 # Apply mapping to categorical features
-data['Education Level'] = data['Education Level'].map(education_level_mapping)
-data['Employment Status'] = data['Employment Status'].map(employment_status_mapping)
-
-# Calculate credit scores using the complete FICO formula
-credit_scores = []
-
-for index, row in data.iterrows():
-    payment_history = row['Payment History']
-    credit_utilization_ratio = row['Credit Utilization Ratio']
-    number_of_credit_accounts = row['Number of Credit Accounts']
-    education_level = row['Education Level']
-    employment_status = row['Employment Status']
+encode_categoricals(data)
 
-    # Apply the FICO formula to calculate the credit score
-    credit_score = (payment_history * 0.35) + (credit_utilization_ratio * 0.30) + (number_of_credit_accounts * 0.15) + (education_level * 0.10) + (employment_status * 0.10)
-    credit_scores.append(credit_score)
-
-# Add the credit scores as a new column to the DataFrame
-data['Credit Score'] = credit_scores
+# Calculate credit scores using the complete FICO formula, one column at a time
+data['Credit Score'] = score_frame(data)
 
 print(data.head())
 
@@ -66,30 +55,25 @@ data['Segment'] = kmeans.labels_
 # Convert the 'Segment' column to category data type
 data['Segment'] = data['Segment'].astype('category')
 
-# Visualize the segments using Plotly
-fig = px.scatter(data, x=data.index, y='Credit Score', color='Segment',
-                 color_discrete_sequence=['green', 'blue', 'yellow', 'red'])
-fig.update_layout(
-    xaxis_title='Customer Index',
-    yaxis_title='Credit Score',
-    title='Customer Segmentation based on Credit Scores'
-)
+# Visualize the segments using Plotly (WebGL or binned density for large portfolios)
+fig = segment_scatter(data)
 fig.show()
 
-data['Segment'] = data['Segment'].map({2: 'Very Low', 
-                                       0: 'Low',
-                                       1: 'Good',
-                                       3: "Excellent"})
+data['Segment'] = data['Segment'].map(segment_mapping)
 
 # Convert the 'Segment' column to category data type
 data['Segment'] = data['Segment'].astype('category')
 
-# Visualize the segments using Plotly
-fig = px.scatter(data, x=data.index, y='Credit Score', color='Segment',
-                 color_discrete_sequence=['green', 'blue', 'yellow', 'red'])
-fig.update_layout(
-    xaxis_title='Customer Index',
-    yaxis_title='Credit Score',
-    title='Customer Segmentation based on Credit Scores'
-)
-fig.show()
\ No newline at end of file
+# Visualize the segments using Plotly (WebGL or binned density for large portfolios)
+fig = segment_scatter(data)
+fig.show()
+
+# Loan repayment: payment and interest of every loan, outstanding balance per segment
+data['Monthly Payment'] = monthly_payment(data['Loan Amount'], data['Interest Rate'], data['Loan Term'])
+data['Total Interest'] = total_interest(data['Loan Amount'], data['Interest Rate'], data['Loan Term'])
+print(data.groupby('Segment', observed=True)[['Loan Amount', 'Monthly Payment', 'Total Interest']].sum())
+
+exposure = portfolio_exposure(data, load_segment_table(), horizon=int(data['Loan Term'].max()))
+exposure_fig = px.line(exposure, title='Outstanding Loan Balance by Segment',
+                       labels={'value': 'Outstanding Balance', 'variable': 'Segment'})
+exposure_fig.show()
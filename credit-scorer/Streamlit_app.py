@@ -1,16 +1,32 @@
 import streamlit as st
-import pickle
-import pandas as pd
+import altair as alt
 import numpy as np
+import pandas as pd
 from PIL import Image
 
-# Load the trained KMeans model from the pickle file
-with open('kmeans_credit_model.pkl', 'rb') as model_file:
-    kmeans_model = pickle.load(model_file)
+from credit_scoring import education_level_mapping, employment_status_mapping
+from score_grid import ScoreGrid
+from segment_table import load_segment_table
+
+
+# Load the segment boundaries exported from the trained KMeans model (see segment_table.py)
+@st.cache_resource
+def load_segments():
+    return load_segment_table()
+
+
+# Score and segment of every input combination, built once per process (see score_grid.py)
+@st.cache_resource
+def load_score_grid():
+    return ScoreGrid(load_segments())
+
 
 # Set up the page configuration
 st.set_page_config(page_title="Credit Score Calculator", page_icon=":money_with_wings:", layout="wide")
 
+segment_table = load_segments()
+score_grid = load_score_grid()
+
 # Set up a sidebar with additional information and inputs
 st.sidebar.title("About")
 st.sidebar.info(
@@ -59,20 +75,13 @@ with col2:
     """)
 
 # Mapping categorical features to numeric values
-education_level_mapping = {'High School': 1, 'Bachelor': 2, 'Master': 3, 'PhD': 4}
-employment_status_mapping = {'Unemployed': 0, 'Employed': 1, 'Self-Employed': 2}
-
 education_level_numeric = education_level_mapping[education_level]
 employment_status_numeric = employment_status_mapping[employment_status]
 
-# Calculate credit score
-credit_score = (
-    (payment_history * 0.35) +
-    (credit_utilization_ratio * 0.30) +
-    (number_of_credit_accounts * 0.15) +
-    (education_level_numeric * 0.10) +
-    (employment_status_numeric * 0.10)
-)
+# Look up the credit score and segment in the precomputed grid
+user_inputs = (payment_history, credit_utilization_ratio, number_of_credit_accounts,
+               education_level_numeric, employment_status_numeric)
+user_credit_score, segment_label = score_grid.lookup(*user_inputs)
 
 # Display the calculated credit score
 st.markdown("""
@@ -81,17 +90,7 @@ st.markdown("""
 st.header("📊 Credit Score & Segment Results")
 
 # Show calculated credit score in a visually appealing metric box
-st.metric(label="Calculated Credit Score", value=f"{credit_score:.2f}")
-
-# Create a DataFrame for prediction
-input_data = pd.DataFrame({'Credit Score': [credit_score]})
-
-# Predict the segment using the KMeans model
-segment = kmeans_model.predict(input_data)[0]
-
-# Mapping the segments to categories
-segment_mapping = {2: 'Very Low', 0: 'Low', 1: 'Good', 3: 'Excellent'}
-segment_label = segment_mapping.get(segment, "Unknown")
+st.metric(label="Calculated Credit Score", value=f"{user_credit_score:.2f}")
 
 # Display the segment using colored messages for more appeal
 if segment_label == "Very Low":
@@ -104,6 +103,31 @@ else:
     st.balloons()
     st.success(f"### Your Credit Segment: {segment_label} 🎉")
 
+# What-if explorer: the segment of every payment history / utilization pair, the other inputs as entered
+segment_codes = score_grid.segment_slice('Payment History', 'Credit Utilization Ratio', user_inputs)
+if segment_codes is not None:
+    st.subheader("🔍 What-if Explorer")
+    st.markdown("Segment for every payment history and utilization, with your other answers unchanged. "
+                "The white point is you.")
+    utilization, history = np.indices(segment_codes.shape)
+    regions = pd.DataFrame({
+        'Payment History': history.ravel(),
+        'Credit Utilization Ratio': utilization.ravel(),
+        'Segment': segment_table.labels[segment_codes.ravel()],
+    })
+    heatmap = alt.Chart(regions).mark_rect().encode(
+        x=alt.X('Payment History:O', axis=alt.Axis(values=list(range(0, 101, 10)))),
+        y=alt.Y('Credit Utilization Ratio:O', sort='descending', axis=alt.Axis(values=list(range(0, 101, 10)))),
+        color=alt.Color('Segment:N', sort=list(segment_table.labels),
+                        scale=alt.Scale(domain=list(segment_table.labels),
+                                        range=['#d62728', '#ff7f0e', '#2ca02c', '#1f77b4'])),
+    )
+    you = alt.Chart(pd.DataFrame({'Payment History': [payment_history],
+                                  'Credit Utilization Ratio': [credit_utilization_ratio]})).mark_point(
+        shape='circle', size=200, filled=True, color='white', stroke='black', strokeWidth=2).encode(
+        x='Payment History:O', y=alt.Y('Credit Utilization Ratio:O', sort='descending'))
+    st.altair_chart(heatmap + you, width='stretch')
+
 # Additional explanation on credit segment
 st.markdown("""
     ---
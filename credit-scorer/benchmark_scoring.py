@@ -0,0 +1,70 @@
+"""Rows per second of the credit score: the old iterrows loop vs the column-wise module.
+
+    python benchmark_scoring.py                     # 1k, 1M and 10M rows
+    python benchmark_scoring.py --sizes 1000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring import credit_score, education_level_mapping, employment_status_mapping, score_frame
+
+
+def synthetic_portfolio(n_rows, seed=0):
+    """Random columns shaped like credit_scoring.csv, with the categoricals already encoded."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Payment History': rng.integers(0, 3000, n_rows).astype(np.float64),
+        'Credit Utilization Ratio': rng.random(n_rows),
+        'Number of Credit Accounts': rng.integers(1, 10, n_rows),
+        'Education Level': rng.choice(list(education_level_mapping.values()), n_rows),
+        'Employment Status': rng.choice(list(employment_status_mapping.values()), n_rows),
+    })
+
+
+def iterrows_scores(data):
+    # The loop CSSP.py used before the shared scoring module
+    credit_scores = []
+    for index, row in data.iterrows():
+        credit_scores.append((row['Payment History'] * 0.35) + (row['Credit Utilization Ratio'] * 0.30)
+                             + (row['Number of Credit Accounts'] * 0.15) + (row['Education Level'] * 0.10)
+                             + (row['Employment Status'] * 0.10))
+    return np.array(credit_scores)
+
+
+def rows_per_second(func, data, n_rows):
+    start = time.perf_counter()
+    result = func(data)
+    return n_rows / (time.perf_counter() - start), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 1_000_000, 10_000_000])
+    parser.add_argument('--iterrows-limit', type=int, default=100_000,
+                        help="Largest size the iterrows loop is timed on (it is far too slow beyond)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12}{'iterrows rows/s':>18}{'column-wise rows/s':>21}{'speed-up':>10}")
+    for n_rows in args.sizes:
+        data = synthetic_portfolio(n_rows)
+        vector_rate, vector_scores = rows_per_second(score_frame, data, n_rows)
+        if n_rows <= args.iterrows_limit:
+            loop_rate, loop_scores = rows_per_second(iterrows_scores, data, n_rows)
+            assert np.array_equal(loop_scores, vector_scores), "column-wise scores differ from the loop"
+            print(f"{n_rows:>12,}{loop_rate:>18,.0f}{vector_rate:>21,.0f}{vector_rate / loop_rate:>9,.0f}x")
+        else:
+            print(f"{n_rows:>12,}{'-':>18}{vector_rate:>21,.0f}{'':>10}")
+        del data
+
+    # The same function also scores a single customer, as the Streamlit calculator does
+    start = time.perf_counter()
+    for _ in range(10000):
+        credit_score(50, 30, 5, 2, 1)
+    print(f"Single scalar score: {(time.perf_counter() - start) / 10000 * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Weights of the FICO-style formula used by CSSP.py and the Streamlit calculator
+SCORE_WEIGHTS = {
+    'Payment History': 0.35,
+    'Credit Utilization Ratio': 0.30,
+    'Number of Credit Accounts': 0.15,
+    'Education Level': 0.10,
+    'Employment Status': 0.10,
+}
+
+# Define the mapping for categorical features
+education_level_mapping = {'High School': 1, 'Bachelor': 2, 'Master': 3, 'PhD': 4}
+employment_status_mapping = {'Unemployed': 0, 'Employed': 1, 'Self-Employed': 2}
+
+# KMeans cluster id -> credit segment, for kmeans_credit_model.pkl
+segment_mapping = {2: 'Very Low', 0: 'Low', 1: 'Good', 3: 'Excellent'}
+
+SCORE_COLUMNS = list(SCORE_WEIGHTS)
+
+
+def credit_score(payment_history, credit_utilization_ratio, number_of_credit_accounts,
+                 education_level, employment_status):
+    """Weighted credit score; works on scalars and on whole NumPy/pandas columns alike.
+
+    ``education_level`` and ``employment_status`` are the numeric codes from the
+    mappings above. The terms are added in the same order as the original
+    per-row loop, so column-wise results are identical to it.
+    """
+    return ((payment_history * SCORE_WEIGHTS['Payment History'])
+            + (credit_utilization_ratio * SCORE_WEIGHTS['Credit Utilization Ratio'])
+            + (number_of_credit_accounts * SCORE_WEIGHTS['Number of Credit Accounts'])
+            + (education_level * SCORE_WEIGHTS['Education Level'])
+            + (employment_status * SCORE_WEIGHTS['Employment Status']))
+
+
+def encode_categoricals(data):
+    """Replace the education and employment text columns with their numeric codes (in place)."""
+    data['Education Level'] = data['Education Level'].map(education_level_mapping)
+    data['Employment Status'] = data['Employment Status'].map(employment_status_mapping)
+    return data
+
+
+def score_frame(data):
+    """Credit score of every row of a frame whose categorical columns are already encoded."""
+    columns = [np.asarray(data[name], dtype=np.float64) for name in SCORE_COLUMNS]
+    return credit_score(*columns)
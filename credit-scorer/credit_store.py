@@ -0,0 +1,183 @@
+"""Columnar copy of credit_scoring.csv with dictionary-encoded text and narrow dtypes.
+
+The CSV is converted once (chunk by chunk, so any size works) into a Parquet file
+next to it. The text columns are dictionary encoded and come back as pandas
+categoricals, and the integer columns are stored as the narrowest type
+that holds them. Reading only some columns skips the others on disk, so the
+scoring step reads the five columns of the formula and nothing else:
+
+    data = load_credit_data()                          # whole dataset
+    inputs = load_credit_data(columns=SCORE_COLUMNS)   # scoring only
+
+The file is rebuilt when the CSV changes size or modification time.
+
+    python credit_store.py            # convert and compare load time and memory with the CSV
+"""
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from credit_scoring import SCORE_COLUMNS
+
+CSV_FILE = 'credit_scoring.csv'
+FORMAT_VERSION = 1
+
+CATEGORICAL_COLUMNS = ['Gender', 'Marital Status', 'Education Level', 'Employment Status', 'Type of Loan']
+
+# Storage type of every column. Casts are checked, so a value that does not fit
+# (a fractional Payment History, a 300-year-old customer) stops the conversion
+# instead of being truncated. The two ratio columns stay float64: float32 would
+# change the credit scores computed from them.
+COLUMN_TYPES = {
+    'Age': 'uint8',
+    'Gender': 'string',
+    'Marital Status': 'string',
+    'Education Level': 'string',
+    'Employment Status': 'string',
+    'Credit Utilization Ratio': 'float64',
+    'Payment History': 'uint16',
+    'Number of Credit Accounts': 'uint8',
+    'Loan Amount': 'uint32',
+    'Interest Rate': 'float64',
+    'Loan Term': 'uint16',
+    'Type of Loan': 'string',
+}
+
+
+def store_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def _arrow_schema():
+    import pyarrow as pa
+    return pa.schema([(name, pa.string() if kind == 'string' else pa.from_numpy_dtype(kind))
+                      for name, kind in COLUMN_TYPES.items()])
+
+
+def convert_csv(csv_path=CSV_FILE, store_path=None, chunk_size=500_000):
+    """Write the columnar copy of ``csv_path`` and return its path."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    store_path = store_path or store_path_for(csv_path)
+    stat = os.stat(csv_path)
+    schema = _arrow_schema().with_metadata({'credit_store': json.dumps({
+        'format_version': FORMAT_VERSION,
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+    })})
+    directory = os.path.dirname(os.path.abspath(store_path))
+    fd, tmp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=directory)
+    os.close(fd)
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression='zstd',
+                              use_dictionary=CATEGORICAL_COLUMNS) as writer:
+            for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+                missing = [name for name in COLUMN_TYPES if name not in chunk.columns]
+                if missing:
+                    raise ValueError(f"{csv_path} is missing columns: {missing}")
+                writer.write_table(pa.Table.from_pandas(chunk[list(COLUMN_TYPES)], schema=schema,
+                                                        preserve_index=False, safe=True))
+        os.replace(tmp_path, store_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return store_path
+
+
+def is_fresh(csv_path, store_path):
+    import pyarrow.parquet as pq
+    try:
+        metadata = pq.read_schema(store_path).metadata or {}
+        info = json.loads(metadata[b'credit_store'])
+    except (OSError, KeyError, ValueError):
+        return False
+    stat = os.stat(csv_path)
+    return (info.get('format_version') == FORMAT_VERSION and info['source_size'] == stat.st_size
+            and info['source_mtime_ns'] == stat.st_mtime_ns)
+
+
+def load_credit_data(csv_path=CSV_FILE, columns=None):
+    """The credit dataset as a DataFrame, read from the columnar copy (built if missing or stale).
+
+    ``columns`` limits the read to those columns.
+    """
+    import pyarrow.parquet as pq
+
+    store_path = _fresh_store(csv_path)
+    columns = list(columns) if columns is not None else list(COLUMN_TYPES)
+    table = pq.read_table(store_path, columns=columns,
+                          read_dictionary=[name for name in columns if name in CATEGORICAL_COLUMNS])
+    return table.to_pandas()
+
+
+def iter_credit_batches(csv_path=CSV_FILE, columns=None, batch_size=250_000):
+    """The credit dataset as DataFrames of up to ``batch_size`` rows, read from the columnar copy.
+
+    For single-pass work (summaries, aggregates) that should not hold the whole table.
+    """
+    import pyarrow.parquet as pq
+
+    store_path = _fresh_store(csv_path)
+    columns = list(columns) if columns is not None else list(COLUMN_TYPES)
+    parquet_file = pq.ParquetFile(store_path,
+                                  read_dictionary=[name for name in columns if name in CATEGORICAL_COLUMNS])
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def _fresh_store(csv_path):
+    store_path = store_path_for(csv_path)
+    if not os.path.exists(store_path) or not is_fresh(csv_path, store_path):
+        convert_csv(csv_path, store_path)
+    return store_path
+
+
+if __name__ == '__main__':
+    import gc
+    import shutil
+    import time
+
+    def measure(load, repeats=3):
+        best = float('inf')
+        for _ in range(repeats):
+            gc.collect()
+            start = time.perf_counter()
+            frame = load()
+            best = min(best, time.perf_counter() - start)
+        return frame, best
+
+    def report(csv_path):
+        convert_csv(csv_path)
+        store_path = store_path_for(csv_path)
+        print(f"{csv_path}: CSV {os.path.getsize(csv_path) / 2**20:.2f} MB, "
+              f"Parquet {os.path.getsize(store_path) / 2**20:.2f} MB")
+        loads = {
+            'CSV, all columns': lambda: pd.read_csv(csv_path),
+            'CSV, score columns': lambda: pd.read_csv(csv_path, usecols=SCORE_COLUMNS),
+            'columnar, all columns': lambda: load_credit_data(csv_path),
+            'columnar, score columns': lambda: load_credit_data(csv_path, columns=SCORE_COLUMNS),
+        }
+        frames = {}
+        for name, load in loads.items():
+            frame, seconds = measure(load)
+            frames[name] = frame
+            memory = frame.memory_usage(deep=True).sum() / 2**20
+            print(f"  {name:>24}: {seconds * 1000:8.1f} ms, {memory:8.2f} MB in memory")
+        # Same values as the CSV, column by column
+        csv_frame, stored = frames['CSV, all columns'], frames['columnar, all columns']
+        for name in COLUMN_TYPES:
+            if not csv_frame[name].equals(stored[name].astype(csv_frame[name].dtype)):
+                raise AssertionError(f"{name} differs from the CSV")
+        print("  all columns equal to the CSV")
+
+    report(CSV_FILE)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        large = os.path.join(tmp_dir, 'credit_scoring_1m.csv')
+        pd.read_csv(CSV_FILE).sample(1_000_000, replace=True, random_state=0).to_csv(large, index=False)
+        report(large)
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,166 @@
+"""Incremental re-segmentation of credit scores with centroid drift detection.
+
+Instead of refitting KMeans on the whole portfolio, the segmenter starts from the
+centroids of kmeans_credit_model.pkl and moves them with mini-batches of new
+scores (each centroid is the running mean of the scores assigned to it). The
+centroids are kept sorted, so "Very Low" is always the lowest one whatever the
+cluster ids are, and the shift of every centroid from the reference model is
+reported after each batch:
+
+    python incremental_segmenter.py new_customers.csv          # update and save
+    python incremental_segmenter.py new_customers.csv --dry-run
+"""
+import json
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from segment_table import MISSING, SegmentTable
+
+# Segment names from the lowest centroid to the highest
+SEGMENT_ORDER = ['Very Low', 'Low', 'Good', 'Excellent']
+STATE_FILE = 'segmenter_state.json'
+
+DriftReport = namedtuple('DriftReport', ['shifts', 'relative_shifts', 'max_relative_shift', 'drifted'])
+
+
+class SegmentDriftWarning(UserWarning):
+    pass
+
+
+class IncrementalSegmenter:
+    def __init__(self, centroids, counts, cluster_ids=None, reference=None, tolerance=0.05, decay=1.0):
+        order = np.argsort(centroids, kind='stable')
+        self.centroids = np.asarray(centroids, dtype=np.float64)[order]
+        self.counts = np.asarray(counts, dtype=np.float64)[order]
+        ids = np.arange(len(order)) if cluster_ids is None else np.asarray(cluster_ids)
+        self.cluster_ids = ids[order]
+        self.reference = self.centroids.copy() if reference is None else np.sort(np.asarray(reference, dtype=np.float64))
+        self.tolerance = tolerance
+        self.decay = decay
+        self.labels = SEGMENT_ORDER if len(self.centroids) == len(SEGMENT_ORDER) else \
+            [f"Segment {i + 1}" for i in range(len(self.centroids))]
+
+    @classmethod
+    def from_kmeans(cls, kmeans_model, **kwargs):
+        """Warm start from a fitted 1-D KMeans; its training labels give the starting counts."""
+        centroids = kmeans_model.cluster_centers_[:, 0]
+        counts = np.bincount(kmeans_model.labels_, minlength=len(centroids))
+        return cls(centroids, counts, np.arange(len(centroids)), **kwargs)
+
+    def assign(self, scores, errors='raise'):
+        """Index (in sorted order) of the nearest centroid for each score.
+
+        Same lookup as the serving ``SegmentTable``: non-finite scores raise
+        ``ValueError``, or get ``MISSING`` with ``errors='coerce'``.
+        """
+        return self.segment_table().interval(scores, errors)
+
+    def partial_fit(self, scores, errors='raise'):
+        """Move the centroids with one mini-batch of scores and return the drift report.
+
+        With ``errors='coerce'`` non-finite scores are left out instead of raising.
+        """
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        nearest = self.assign(scores, errors)
+        scores, nearest = scores[nearest != MISSING], nearest[nearest != MISSING]
+        if len(scores):
+            batch_counts = np.bincount(nearest, minlength=len(self.centroids))
+            batch_sums = np.bincount(nearest, weights=scores, minlength=len(self.centroids))
+            # Optionally forget old data so the centroids can follow a trend
+            self.counts *= self.decay
+            updated = batch_counts > 0
+            total = self.counts + batch_counts
+            self.centroids[updated] += (batch_sums[updated] - batch_counts[updated] * self.centroids[updated]) \
+                / total[updated]
+            self.counts = total
+
+            # Keep the centroids sorted so the label of each segment never flips
+            order = np.argsort(self.centroids, kind='stable')
+            self.centroids, self.counts, self.cluster_ids = self.centroids[order], self.counts[order], \
+                self.cluster_ids[order]
+
+        report = self.drift()
+        if report.drifted:
+            warnings.warn(f"Segment centroids moved {report.max_relative_shift:.1%} of the reference range "
+                          f"(tolerance {self.tolerance:.1%})", SegmentDriftWarning, stacklevel=2)
+        return report
+
+    def drift(self):
+        """Shift of every centroid from the reference, also relative to the reference range."""
+        shifts = self.centroids - self.reference
+        spread = max(self.reference[-1] - self.reference[0], 1e-12)
+        relative = np.abs(shifts) / spread
+        max_relative = float(relative.max()) if len(relative) else 0.0
+        return DriftReport(shifts, relative, max_relative, max_relative > self.tolerance)
+
+    def accept(self):
+        """Make the current centroids the new reference, e.g. after reviewing a drift."""
+        self.reference = self.centroids.copy()
+
+    def segment_table(self):
+        return SegmentTable(self.centroids, self.cluster_ids, self.labels)
+
+    def save(self, path=STATE_FILE):
+        with open(path, 'w') as f:
+            json.dump({
+                'centroids': self.centroids.tolist(),
+                'counts': self.counts.tolist(),
+                'cluster_ids': self.cluster_ids.tolist(),
+                'reference': self.reference.tolist(),
+                'tolerance': self.tolerance,
+                'decay': self.decay,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        with open(path) as f:
+            state = json.load(f)
+        return cls(state['centroids'], state['counts'], state['cluster_ids'], state['reference'],
+                   state['tolerance'], state['decay'])
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import pickle
+    import time
+    import pandas as pd
+    from credit_scoring import encode_categoricals, score_frame
+
+    parser = argparse.ArgumentParser(description="Update the credit segments with new customers")
+    parser.add_argument('input', help="CSV of new customers shaped like credit_scoring.csv")
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help="Largest centroid shift, as a fraction of the reference range, before warning")
+    parser.add_argument('--decay', type=float, default=1.0, help="Weight kept by old data before each batch")
+    parser.add_argument('--dry-run', action='store_true', help="Report drift without saving anything")
+    parser.add_argument('--skip-missing', action='store_true',
+                        help="Leave out rows whose score cannot be computed instead of stopping")
+    args = parser.parse_args()
+
+    if os.path.exists(STATE_FILE):
+        segmenter = IncrementalSegmenter.load(STATE_FILE)
+        segmenter.tolerance, segmenter.decay = args.tolerance, args.decay
+    else:
+        with open('kmeans_credit_model.pkl', 'rb') as model_file:
+            segmenter = IncrementalSegmenter.from_kmeans(pickle.load(model_file), tolerance=args.tolerance,
+                                                         decay=args.decay)
+
+    rows = 0
+    start = time.perf_counter()
+    for chunk in pd.read_csv(args.input, chunksize=args.chunk_size):
+        segmenter.partial_fit(score_frame(encode_categoricals(chunk)), 'coerce' if args.skip_missing else 'raise')
+        rows += len(chunk)
+    seconds = time.perf_counter() - start
+
+    print(f"Updated with {rows:,} scores in {seconds:.2f}s")
+    for label, centroid, shift in zip(segmenter.labels, segmenter.centroids, segmenter.drift().shifts):
+        print(f"{label:>10}: centroid {centroid:9.3f} (shift {shift:+.3f})")
+    report = segmenter.drift()
+    print(f"Max relative shift {report.max_relative_shift:.2%}, drifted: {report.drifted}")
+    if not args.dry_run:
+        segmenter.save()
+        segmenter.segment_table().save()
+        print(f"Saved {STATE_FILE} and the serving segment table")
@@ -0,0 +1,53 @@
+import time
+
+import streamlit as st
+
+from portfolio_cube import DIMENSIONS, SharedCube
+
+
+# The cube is built on first use and only folds in new rows afterwards (see portfolio_cube.py).
+# A refresh swaps in a new cube, so other sessions never see one being changed.
+@st.cache_resource
+def load_shared_cube():
+    return SharedCube('credit_scoring.csv')
+
+
+st.set_page_config(page_title="Portfolio Dashboard", page_icon=":bar_chart:", layout="wide")
+
+shared_cube = load_shared_cube()
+cube = shared_cube.cube
+if st.sidebar.button("Refresh from credit_scoring.csv"):
+    before = int(cube.counts.sum())
+    cube = shared_cube.refresh()
+    st.sidebar.success(f"{int(cube.counts.sum()):,} customers ({int(cube.counts.sum()) - before:+,})")
+
+st.title("📈 Portfolio Segmentation Dashboard")
+st.markdown("Credit segments of the whole customer portfolio, filtered and grouped by customer profile.")
+
+# Filters in the sidebar, one per dimension
+st.sidebar.header("Filters")
+filters = {}
+for name in DIMENSIONS:
+    selected = st.sidebar.multiselect(name, cube.domains[name], default=cube.domains[name], key=f"filter_{name}")
+    if len(selected) < len(cube.domains[name]):
+        filters[name] = selected
+
+group_by = st.multiselect("Group by", DIMENSIONS, default=['Segment'], key='group_by')
+
+start = time.perf_counter()
+totals = cube.query(filters)
+groups = cube.query(filters, group_by)
+query_ms = (time.perf_counter() - start) * 1000
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Customers", f"{int(totals['Customers'].iloc[0]):,}")
+col2.metric("Average Credit Score", f"{totals['Average Credit Score'].iloc[0]:.1f}")
+col3.metric("Median Credit Score", f"{totals['Median Credit Score'].iloc[0]:.0f}")
+col4.metric("Total Loan Amount", f"{totals['Total Loan Amount'].iloc[0]:,.0f}")
+
+if group_by:
+    chart_data = groups['Customers'].copy()
+    chart_data.index = [' / '.join(map(str, key)) for key in chart_data.index]
+    st.bar_chart(chart_data)
+st.dataframe(groups.round(2))
+st.caption(f"Answered from {cube.counts.size:,} pre-aggregated cells in {query_ms:.1f} ms.")
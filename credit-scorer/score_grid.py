@@ -0,0 +1,130 @@
+"""Every credit score and segment the calculator can show, computed once.
+
+The calculator has five inputs: payment history (0-100), utilization (0-100),
+the number of accounts, education and employment. The grid holds the score and
+segment of each combination, with up to ``MAX_ACCOUNTS`` accounts (2.4 million
+cells). Every score is a multiple of 0.05, so it is stored exactly as a
+``uint16`` count of twentieths and the segment as a ``uint8`` code, 7 MB in all.
+A slider move is then an array lookup, and a 2-D slice of the grid gives the
+segment regions around the user. Inputs outside the grid (more accounts) are
+computed directly.
+
+    python score_grid.py              # build time, size and parity with the direct computation
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from credit_scoring import credit_score, education_level_mapping, employment_status_mapping
+
+MAX_ACCOUNTS = 20
+
+# The values of each input along its axis of the grid
+GRID_AXES = {
+    'Payment History': np.arange(0, 101),
+    'Credit Utilization Ratio': np.arange(0, 101),
+    'Number of Credit Accounts': np.arange(1, MAX_ACCOUNTS + 1),
+    'Education Level': np.array(sorted(education_level_mapping.values())),
+    'Employment Status': np.array(sorted(employment_status_mapping.values())),
+}
+AXIS_NAMES = list(GRID_AXES)
+
+GridResult = namedtuple('GridResult', ['score', 'segment'])
+
+
+class ScoreGrid:
+    def __init__(self, segment_table, axes=GRID_AXES):
+        self.segment_table = segment_table
+        self.axes = {name: np.asarray(values) for name, values in axes.items()}
+        mesh = np.meshgrid(*self.axes.values(), indexing='ij', sparse=True)
+        scores = credit_score(*[m.astype(np.float64) for m in mesh])
+        # Segments from the float scores, exactly as the calculator computes them
+        self.segments = segment_table.interval(scores).astype(np.uint8)
+        self.scores_x20 = np.rint(scores * 20).astype(np.uint16)
+        # Position of each input value along its axis (the axes are evenly spaced integers)
+        self._offsets = [int(values[0]) for values in self.axes.values()]
+        self._steps = [int(values[1] - values[0]) if len(values) > 1 else 1 for values in self.axes.values()]
+        self._sizes = [len(values) for values in self.axes.values()]
+
+    @property
+    def nbytes(self):
+        return self.scores_x20.nbytes + self.segments.nbytes
+
+    def index_of(self, inputs):
+        """Grid index of a full set of inputs (in AXIS_NAMES order), or None if outside the grid."""
+        # Plain Python arithmetic: this runs on every rerun of the calculator
+        index = []
+        for value, offset, step, size in zip(inputs, self._offsets, self._steps, self._sizes):
+            position, remainder = divmod(value - offset, step)
+            if remainder or not 0 <= position < size:
+                return None
+            index.append(int(position))
+        return tuple(index)
+
+    def lookup(self, payment_history, credit_utilization_ratio, number_of_credit_accounts,
+               education_level, employment_status):
+        """Score and segment label for one combination of inputs (numeric codes for the categoricals)."""
+        inputs = (payment_history, credit_utilization_ratio, number_of_credit_accounts, education_level,
+                  employment_status)
+        index = self.index_of(inputs)
+        if index is None:
+            score = credit_score(*inputs)
+            return GridResult(float(score), self.segment_table.segment(score))
+        return GridResult(self.scores_x20[index] / 20,
+                          self.segment_table.labels[self.segments[index]])
+
+    def segment_slice(self, x_axis, y_axis, inputs):
+        """Segment codes over two axes (shape len(y) x len(x)) with the other inputs fixed.
+
+        ``inputs`` holds a value for every axis; those of ``x_axis`` and ``y_axis``
+        are ignored. Returns None if the fixed inputs fall outside the grid.
+        """
+        x, y = AXIS_NAMES.index(x_axis), AXIS_NAMES.index(y_axis)
+        fixed = list(inputs)
+        fixed[x], fixed[y] = self.axes[x_axis][0], self.axes[y_axis][0]
+        index = self.index_of(fixed)
+        if index is None:
+            return None
+        index = list(index)
+        index[x], index[y] = slice(None), slice(None)
+        codes = self.segments[tuple(index)]
+        return codes.T if x < y else codes
+
+
+if __name__ == '__main__':
+    import itertools
+    import time
+    from segment_table import load_segment_table
+
+    table = load_segment_table()
+    start = time.perf_counter()
+    grid = ScoreGrid(table)
+    build = time.perf_counter() - start
+    print(f"{grid.segments.size:,} cells, {grid.nbytes / 2**20:.1f} MB, built in {build * 1000:.0f} ms")
+
+    # Cells of a 5-step sub-grid against the calculator's scalar path
+    mismatches = 0
+    for inputs in itertools.product(*[values.tolist() for values in GRID_AXES.values()]):
+        if inputs[0] % 5 or inputs[1] % 5:
+            continue
+        score = credit_score(*inputs)
+        result = grid.lookup(*inputs)
+        mismatches += f"{result.score:.2f}" != f"{score:.2f}" or result.segment != table.segment(score)
+    print(f"Scalar parity on the 5-step sub-grid: {mismatches} mismatches")
+    scores = credit_score(*[m.astype(np.float64) for m in np.meshgrid(*GRID_AXES.values(), indexing='ij')])
+    print(f"Stored scores exact: {np.array_equal(grid.scores_x20 / 20, np.round(scores, 2))}")
+
+    rng = np.random.default_rng(0)
+    queries = [tuple(int(rng.choice(v)) for v in GRID_AXES.values()) for _ in range(10000)]
+    start = time.perf_counter()
+    for q in queries:
+        grid.lookup(*q)
+    lookup_us = (time.perf_counter() - start) / len(queries) * 1e6
+    start = time.perf_counter()
+    for q in queries:
+        table.segment(credit_score(*q))
+    direct_us = (time.perf_counter() - start) / len(queries) * 1e6
+    start = time.perf_counter()
+    grid.segment_slice('Payment History', 'Credit Utilization Ratio', queries[0])
+    slice_us = (time.perf_counter() - start) * 1e6
+    print(f"Lookup {lookup_us:.1f} us vs direct {direct_us:.1f} us; 101x101 slice {slice_us:.0f} us")
@@ -0,0 +1,128 @@
+"""Customer segmentation scatter plots that stay responsive at any portfolio size.
+
+``segment_scatter`` picks how to draw the credit score of every customer
+against its index, coloured by segment:
+
+* up to ``webgl_threshold`` points: the same ``px.scatter`` as before (SVG),
+* up to ``density_threshold`` points: the same figure drawn with WebGL,
+* beyond that: each segment is binned on a fixed grid on the server and only the
+  non-empty cells are sent, with their opacity following the count, so the
+  figure never holds more than ``segments * bins[0] * bins[1]`` points.
+
+    python segment_plots.py           # payload size and build time of each mode
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+SEGMENT_COLORS = ['green', 'blue', 'yellow', 'red']
+WEBGL_THRESHOLD = 20_000
+DENSITY_THRESHOLD = 500_000
+DENSITY_BINS = (400, 200)
+
+
+def choose_mode(n_points, webgl_threshold=WEBGL_THRESHOLD, density_threshold=DENSITY_THRESHOLD):
+    if n_points <= webgl_threshold:
+        return 'svg'
+    if n_points <= density_threshold:
+        return 'webgl'
+    return 'density'
+
+
+def segment_order(segments, order=None):
+    """Segments in legend order: ``order`` if given, else in order of first appearance.
+
+    First appearance is the order ``px.scatter`` uses, so the default keeps the
+    colours the plots always had.
+    """
+    if order is not None:
+        return list(order)
+    return list(pd.unique(segments.dropna()))
+
+
+def segment_colors(order, colors=SEGMENT_COLORS):
+    """Colour of each segment, by its position in ``order``, the same in every mode."""
+    return {segment: colors[i % len(colors)] for i, segment in enumerate(order)}
+
+
+def density_traces(x, y, segments, color_map, bins=DENSITY_BINS):
+    """One WebGL trace per segment of ``color_map`` (in its order), with a marker at the
+    centre of every non-empty grid cell."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # A shared grid so the cells of different segments line up
+    x_edges = np.linspace(x.min(), x.max(), bins[0] + 1)
+    y_edges = np.linspace(y.min(), y.max(), bins[1] + 1)
+    x_centres = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centres = (y_edges[:-1] + y_edges[1:]) / 2
+
+    traces = []
+    segments = np.asarray(segments, dtype=object)
+    for segment, segment_color in color_map.items():
+        in_segment = segments == segment
+        if not in_segment.any():
+            continue
+        counts, _, _ = np.histogram2d(x[in_segment], y[in_segment], bins=[x_edges, y_edges])
+        cx, cy = np.nonzero(counts)
+        cell_counts = counts[cx, cy]
+        # Log scale, so sparse outliers stay visible next to dense cells
+        opacity = 0.25 + 0.75 * np.log1p(cell_counts) / np.log1p(cell_counts.max())
+        traces.append(go.Scattergl(
+            x=x_centres[cx], y=y_centres[cy], mode='markers', name=str(segment), legendgroup=str(segment),
+            marker=dict(color=segment_color, opacity=np.round(opacity, 3)),
+            customdata=cell_counts.astype(np.int64),
+            hovertemplate='Segment=' + str(segment) + '<br>Customers in cell=%{customdata}<extra></extra>',
+        ))
+    return traces
+
+
+def segment_scatter(data, y='Credit Score', color='Segment', colors=SEGMENT_COLORS, mode='auto',
+                    webgl_threshold=WEBGL_THRESHOLD, density_threshold=DENSITY_THRESHOLD, bins=DENSITY_BINS,
+                    order=None):
+    """Scatter of ``y`` against the row index of ``data``, coloured by ``color``.
+
+    ``mode`` is 'auto' (by row count), 'svg', 'webgl' or 'density'. Colours go
+    to the segments in order of first appearance, as in the original
+    ``px.scatter``, unless ``order`` fixes the legend order (e.g.
+    ``segment_table.labels``); every mode uses the same segment to colour mapping.
+    """
+    if mode == 'auto':
+        mode = choose_mode(len(data), webgl_threshold, density_threshold)
+    order = segment_order(data[color], order)
+    color_map = segment_colors(order, colors)
+    if mode == 'density':
+        fig = go.Figure(density_traces(data.index, data[y], data[color], color_map, bins))
+        fig.update_layout(legend_title_text=color)
+    else:
+        fig = px.scatter(data, x=data.index, y=y, color=color, category_orders={color: order},
+                         color_discrete_map=color_map, render_mode='webgl' if mode == 'webgl' else 'svg')
+    fig.update_layout(
+        xaxis_title='Customer Index',
+        yaxis_title=y,
+        title='Customer Segmentation based on Credit Scores'
+    )
+    return fig
+
+
+if __name__ == '__main__':
+    import time
+    from credit_scoring import encode_categoricals, score_frame
+    from segment_table import load_segment_table
+
+    data = encode_categoricals(pd.read_csv('credit_scoring.csv'))
+    table = load_segment_table()
+    rng = np.random.default_rng(0)
+    for n in [1_000, 100_000, 1_000_000, 5_000_000]:
+        sample = data.sample(n, replace=n > len(data), random_state=0, ignore_index=True)
+        scores = score_frame(sample) + (rng.normal(0, 5, n) if n > len(data) else 0)
+        frame = pd.DataFrame({'Credit Score': scores, 'Segment': table.segment(scores)})
+        frame['Segment'] = frame['Segment'].astype('category')
+        for mode in ['svg', 'webgl', 'density']:
+            if mode != 'density' and n > 1_000_000:
+                continue
+            start = time.perf_counter()
+            payload = segment_scatter(frame, mode=mode, order=table.labels).to_json()
+            seconds = time.perf_counter() - start
+            auto = ' (auto)' if mode == choose_mode(n) else ''
+            print(f"{n:>9,} rows {mode:>7}{auto:7}: {len(payload) / 2**20:8.2f} MB JSON in {seconds:.2f}s")
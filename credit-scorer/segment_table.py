@@ -0,0 +1,119 @@
+"""Credit segment lookup without sklearn.
+
+With a single feature, KMeans assigns a score to the nearest centroid, which is
+the same as comparing it with the midpoints between the sorted centroids. The
+exported table keeps those midpoints and the label of each interval, and lookup
+is one ``numpy.searchsorted``.
+
+A score that is not finite (an unmapped Education Level or Employment Status
+gives NaN) has no segment. Lookups raise ``ValueError`` for it, as
+``KMeans.predict`` did; with ``errors='coerce'`` it gets the code ``MISSING``
+(-1, the missing code of ``pandas.Categorical``) instead. Parity with the
+pickled model is checked by test_segment_table.py.
+
+    python segment_table.py            # time the lookup against KMeans.predict
+    python segment_table.py --export   # rewrite segment_table.json from kmeans_credit_model.pkl
+"""
+import json
+
+import numpy as np
+
+from credit_scoring import segment_mapping
+
+TABLE_FILE = 'segment_table.json'
+MISSING = -1
+
+
+class SegmentTable:
+    def __init__(self, centroids, cluster_ids, labels):
+        order = np.argsort(centroids, kind='stable')
+        self.centroids = np.asarray(centroids, dtype=np.float64)[order]
+        self.cluster_ids = np.asarray(cluster_ids)[order]
+        self.labels = np.asarray(labels, dtype=object)[order]
+        self.boundaries = (self.centroids[:-1] + self.centroids[1:]) / 2
+        # A score exactly on a midpoint goes to the cluster KMeans would pick: the lower cluster id
+        self.tie_goes_left = self.cluster_ids[:-1] < self.cluster_ids[1:]
+
+    @classmethod
+    def from_kmeans(cls, kmeans_model, mapping=segment_mapping):
+        centroids = kmeans_model.cluster_centers_[:, 0]
+        cluster_ids = np.arange(len(centroids))
+        return cls(centroids, cluster_ids, [mapping.get(int(c), 'Unknown') for c in cluster_ids])
+
+    def to_dict(self):
+        return {
+            'feature': 'Credit Score',
+            'centroids': self.centroids.tolist(),
+            'cluster_ids': self.cluster_ids.tolist(),
+            'labels': self.labels.tolist(),
+            'boundaries': self.boundaries.tolist(),
+        }
+
+    def save(self, path=TABLE_FILE):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    def interval(self, scores, errors='raise'):
+        """Position of each score's segment in ``labels``.
+
+        Non-finite scores raise ``ValueError``, or get ``MISSING`` with ``errors='coerce'``.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        # searchsorted puts NaN after every boundary, which would read as the top segment
+        finite = np.isfinite(scores)
+        if errors == 'raise' and not finite.all():
+            raise ValueError(f"{np.size(scores) - np.count_nonzero(finite)} credit score(s) are not finite "
+                             f"and have no segment")
+        index = np.searchsorted(self.boundaries, scores, side='right')
+        on_boundary = (index > 0) & (scores == self.boundaries[np.maximum(index - 1, 0)])
+        index = index - (on_boundary & self.tie_goes_left[np.maximum(index - 1, 0)])
+        return index if finite.all() else np.where(finite, index, MISSING)
+
+    def cluster(self, scores, errors='raise'):
+        """KMeans cluster id of each score (-1 for a coerced missing score); a scalar gives a scalar."""
+        index = self.interval(scores, errors)
+        if np.ndim(index) == 0:
+            return -1 if index == MISSING else int(self.cluster_ids[index])
+        return np.where(index == MISSING, -1, self.cluster_ids[index])
+
+    def segment(self, scores, errors='raise'):
+        """Segment label of each score ('Very Low', 'Low', ...); a scalar gives a string.
+
+        With ``errors='coerce'`` a non-finite score gets None.
+        """
+        index = self.interval(scores, errors)
+        if np.ndim(index) == 0:
+            return None if index == MISSING else self.labels[index]
+        missing = index == MISSING
+        return np.where(missing, None, self.labels[index]) if missing.any() else self.labels[index]
+
+
+def load_segment_table(path=TABLE_FILE):
+    with open(path) as f:
+        table = json.load(f)
+    return SegmentTable(table['centroids'], table['cluster_ids'], table['labels'])
+
+
+if __name__ == '__main__':
+    import pickle
+    import sys
+    import time
+    import pandas as pd
+
+    with open('kmeans_credit_model.pkl', 'rb') as model_file:
+        kmeans_model = pickle.load(model_file)
+    if '--export' in sys.argv[1:]:
+        SegmentTable.from_kmeans(kmeans_model).save()
+        print(f"Wrote {TABLE_FILE}")
+    table = load_segment_table()
+    print(f"Boundaries: {np.round(table.boundaries, 3).tolist()} -> labels {table.labels.tolist()}")
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        table.segment(512.3)
+    scalar_us = (time.perf_counter() - start) / 10000 * 1e6
+    start = time.perf_counter()
+    kmeans_model.predict(pd.DataFrame({'Credit Score': [512.3]}))
+    sklearn_us = (time.perf_counter() - start) * 1e6
+    print(f"Single score: table {scalar_us:.1f} us, KMeans.predict {sklearn_us:.0f} us")
@@ -0,0 +1,158 @@
+"""Score and segment credit portfolio files of any size, one chunk at a time.
+
+Each chunk of the input CSV gets the same treatment as CSSP.py (categorical
+mappings, credit score, segment) and is appended to a Parquet file, so peak
+memory depends on the chunk size rather than on the size of the portfolio:
+
+    python stream_scoring.py credit_scoring.csv scored.parquet --chunk-size 500000
+"""
+import argparse
+import os
+import resource
+import time
+
+import pandas as pd
+
+from credit_scoring import encode_categoricals, score_frame
+from segment_table import load_segment_table
+
+# Output type of every column of a scored credit_scoring.csv. The mapped columns and
+# the score are float so an unmapped value stays a missing row instead of failing
+# the write; integer columns take nulls too. Other columns keep the type inferred
+# from the first chunk.
+OUTPUT_TYPES = {
+    'Age': 'int64',
+    'Gender': 'string',
+    'Marital Status': 'string',
+    'Education Level': 'float64',
+    'Employment Status': 'float64',
+    'Credit Utilization Ratio': 'float64',
+    'Payment History': 'float64',
+    'Number of Credit Accounts': 'int64',
+    'Loan Amount': 'int64',
+    'Interest Rate': 'float64',
+    'Loan Term': 'int64',
+    'Type of Loan': 'string',
+    'Credit Score': 'float64',
+}
+
+
+def score_chunk(chunk, segment_table):
+    """Add ``Credit Score`` and ``Segment`` to one chunk, like CSSP.py does for the whole frame.
+
+    Rows with an unmapped Education Level or Employment Status keep a missing
+    score and a missing segment instead of stopping the whole stream.
+    """
+    encode_categoricals(chunk)
+    chunk['Credit Score'] = score_frame(chunk)
+    segments = pd.CategoricalDtype(list(segment_table.labels), ordered=True)
+    codes = segment_table.interval(chunk['Credit Score'].to_numpy(), errors='coerce')
+    chunk['Segment'] = pd.Categorical.from_codes(codes, dtype=segments)
+    return chunk
+
+
+class ParquetSink:
+    """Appends chunks to one Parquet file as separate row groups.
+
+    The schema is fixed at the first chunk: ``OUTPUT_TYPES`` for the known
+    columns, an ordered dictionary of ``segment_labels`` for Segment, and the
+    inferred type for anything else. Every chunk is converted to it, so the row
+    groups line up even when a later chunk has missing values.
+    """
+
+    def __init__(self, path, segment_labels=()):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from exc
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self.segment_labels = list(segment_labels)
+        self.schema = None
+        self.writer = None
+
+    def schema_for(self, chunk):
+        pa = self._pa
+        inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+        fields = []
+        for field in inferred:
+            if field.name in OUTPUT_TYPES:
+                kind = OUTPUT_TYPES[field.name]
+                field = pa.field(field.name, pa.string() if kind == 'string' else pa.from_numpy_dtype(kind))
+            elif field.name == 'Segment':
+                field = pa.field('Segment', pa.dictionary(pa.int8(), pa.string(), ordered=True))
+            fields.append(field)
+        return pa.schema(fields, metadata=inferred.metadata)
+
+    def write(self, chunk):
+        if self.writer is None:
+            self.schema = self.schema_for(chunk)
+            self.writer = self._pq.ParquetWriter(self.path, self.schema, compression='zstd')
+        self.writer.write_table(self._pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.path, mode='w' if self.header else 'a', header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+def stream_score(input_path, output_path, chunk_size=250_000, output_format='parquet', progress=None):
+    """Score ``input_path`` chunk by chunk into ``output_path`` and return throughput metrics."""
+    segment_table = load_segment_table()
+    sink = ParquetSink(output_path, segment_table.labels) if output_format == 'parquet' else CsvSink(output_path)
+    rows = chunks = 0
+    start = time.perf_counter()
+    try:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+            sink.write(score_chunk(chunk, segment_table))
+            rows += len(chunk)
+            chunks += 1
+            if progress is not None:
+                progress(rows)
+    finally:
+        sink.close()
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds) if seconds else None,
+        'input_mb': round(os.path.getsize(input_path) / 2**20, 1),
+        'output_mb': round(os.path.getsize(output_path) / 2**20, 1),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming credit scoring and segmentation")
+    parser.add_argument('input', help="Portfolio CSV shaped like credit_scoring.csv")
+    parser.add_argument('output', help="Output file (.parquet or .csv)")
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--format', choices=['parquet', 'csv'],
+                        help="Output format; defaults to the output file's extension")
+    args = parser.parse_args()
+
+    output_format = args.format or ('csv' if args.output.endswith('.csv') else 'parquet')
+    metrics = stream_score(args.input, args.output, args.chunk_size, output_format,
+                           progress=lambda rows: print(f"\r{rows:,} rows scored", end='', flush=True))
+    print()
+    for name, value in metrics.items():
+        print(f"{name:>16}: {value}")
+
+
+if __name__ == '__main__':
+    main()
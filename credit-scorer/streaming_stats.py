@@ -0,0 +1,283 @@
+"""Single-pass, mergeable summary statistics for the numeric credit columns.
+
+``ColumnSummary`` gives the same ``describe()`` table and correlation matrix as
+pandas without keeping the rows. It accumulates chunk after chunk and two
+summaries of different chunks (or of different worker processes) merge into
+the summary of both:
+
+* count, mean and the sum of squared deviations per column, combined with the
+  parallel form of Welford's update (Chan et al.), which gives the standard deviation,
+* the co-moment matrix of rows with no missing value, which gives the correlations,
+* min and max,
+* a KLL-style quantile sketch per column for the 25%, 50% and 75% rows. Below
+  ``sketch_size`` values it holds every value, so the quartiles are exact.
+
+    python streaming_stats.py         # compare with pandas on credit_scoring.csv
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ['Age', 'Credit Utilization Ratio', 'Payment History', 'Number of Credit Accounts',
+                   'Loan Amount', 'Interest Rate', 'Loan Term']
+PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class QuantileSketch:
+    """Mergeable approximate quantiles: levels of sampled values, level ``i`` weighing ``2**i``.
+
+    When a level grows past ``k`` values it is sorted and every other value
+    (random offset) moves up one level with twice the weight.
+    """
+
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values[~np.isnan(values)]])
+        self._compact()
+        return self
+
+    def merge(self, other):
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self._compact()
+        return self
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.k:
+                values = np.sort(values)
+                # An even number of values is halved; an odd one out stays at this level
+                keep = len(values) % 2
+                promoted = values[keep:][self.rng.integers(2)::2]
+                self.levels[level] = values[:keep]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    @property
+    def count(self):
+        return sum(len(values) << level for level, values in enumerate(self.levels))
+
+    def quantile(self, q):
+        """Quantile with pandas' linear interpolation; exact while no level has been compacted."""
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return np.nan
+        weights = np.concatenate([np.full(len(v), 2.0 ** level) for level, v in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        # Rank of the middle of the block of rows each kept value stands for
+        positions = np.cumsum(weights) - 1 - (weights - 1) / 2
+        return float(np.interp(np.asarray(q) * (weights.sum() - 1), positions, values))
+
+
+class ColumnSummary:
+    def __init__(self, columns, sketch_size=4096, seed=0):
+        self.columns = list(columns)
+        n = len(self.columns)
+        # Per column, ignoring missing values (what describe() does)
+        self.count = np.zeros(n)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        # Over complete rows only, for the correlations
+        self.complete_count = 0
+        self.complete_mean = np.zeros(n)
+        self.comoment = np.zeros((n, n))
+        self.sketches = [QuantileSketch(sketch_size, seed + i) for i in range(n)]
+
+    def update(self, chunk):
+        """Add a DataFrame chunk (or a 2-D array with the columns in order)."""
+        values = np.asarray(chunk[self.columns] if isinstance(chunk, pd.DataFrame) else chunk, dtype=np.float64)
+        present = ~np.isnan(values)
+        count = present.sum(axis=0)
+        filled = np.where(present, values, 0.0)
+        mean = np.divide(filled.sum(axis=0), count, out=np.zeros(len(count)), where=count > 0)
+        m2 = (np.where(present, values - mean, 0.0) ** 2).sum(axis=0)
+        self._merge_moments(count, mean, m2)
+        with np.errstate(invalid='ignore'):
+            self.min = np.fmin(self.min, np.nanmin(np.where(present, values, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(present, values, -np.inf), axis=0))
+
+        complete = values[present.all(axis=1)]
+        if len(complete):
+            complete_mean = complete.mean(axis=0)
+            centred = complete - complete_mean
+            self._merge_comoment(len(complete), complete_mean, centred.T @ centred)
+
+        for sketch, column in zip(self.sketches, values.T):
+            sketch.update(column)
+        return self
+
+    def merge(self, other):
+        """Fold the summary of other rows into this one."""
+        if other.columns != self.columns:
+            raise ValueError("Only summaries of the same columns can be merged")
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        if other.complete_count:
+            self._merge_comoment(other.complete_count, other.complete_mean, other.comoment)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        safe_total = np.where(total > 0, total, 1)
+        self.mean = self.mean + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+
+    def _merge_comoment(self, count, mean, comoment):
+        total = self.complete_count + count
+        delta = mean - self.complete_mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * self.complete_count * count / total
+        self.complete_mean = self.complete_mean + delta * count / total
+        self.complete_count = total
+
+    def describe(self, percentiles=PERCENTILES):
+        """The table ``DataFrame.describe()`` prints for these columns."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        rows = {'count': self.count, 'mean': np.where(self.count > 0, self.mean, np.nan), 'std': std,
+                'min': np.where(self.count > 0, self.min, np.nan)}
+        for q in percentiles:
+            rows[f"{q * 100:g}%"] = [sketch.quantile(q) for sketch in self.sketches]
+        rows['max'] = np.where(self.count > 0, self.max, np.nan)
+        return pd.DataFrame(rows, index=self.columns).T
+
+    def corr(self, columns=None):
+        """Pearson correlation matrix, like ``DataFrame.corr()`` on data without missing values."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = np.sqrt(np.diag(self.comoment))
+            matrix = self.comoment / np.outer(scale, scale)
+        result = pd.DataFrame(np.clip(matrix, -1, 1), index=self.columns, columns=self.columns)
+        return result if columns is None else result.loc[columns, columns]
+
+
+class RangeReader:
+    """File-like view of the bytes ``start:end`` of a file, for pandas.read_csv."""
+
+    def __init__(self, path, start, end):
+        self.file = open(path, 'rb')
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def read(self, size=-1):
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _line_offsets(csv_path, parts):
+    """About ``parts`` byte ranges of the data rows, each starting at the beginning of a line."""
+    size = os.path.getsize(csv_path)
+    with open(csv_path, 'rb') as f:
+        f.readline()
+        offsets = [f.tell()]
+        for i in range(1, parts):
+            f.seek(max(offsets[-1], size * i // parts))
+            f.readline()
+            if f.tell() < size and f.tell() > offsets[-1]:
+                offsets.append(f.tell())
+    return list(zip(offsets, offsets[1:] + [size]))
+
+
+def _summarize_range(args):
+    csv_path, start, end, names, columns, chunk_size, sketch_size, seed = args
+    summary = ColumnSummary(columns, sketch_size, seed)
+    reader = RangeReader(csv_path, start, end)
+    try:
+        for chunk in pd.read_csv(reader, header=None, names=names, usecols=columns, chunksize=chunk_size):
+            summary.update(chunk)
+    finally:
+        reader.close()
+    return summary
+
+
+def summarize_frames(frames, columns=NUMERIC_COLUMNS, sketch_size=4096):
+    """Summary of ``columns`` over an iterable of DataFrame chunks (e.g. Parquet batches)."""
+    summary = ColumnSummary(columns, sketch_size)
+    for frame in frames:
+        summary.update(frame)
+    return summary
+
+
+def summarize_csv(csv_path, columns=NUMERIC_COLUMNS, chunk_size=250_000, workers=1, sketch_size=4096):
+    """Summary of ``columns`` of a CSV of any size, read once in chunks.
+
+    With ``workers > 1`` the file is cut into byte ranges at line breaks; each
+    worker process parses and summarises its own range and the partial
+    summaries are merged.
+    """
+    columns = list(columns)
+    if workers <= 1:
+        return summarize_frames(pd.read_csv(csv_path, usecols=columns, chunksize=chunk_size), columns, sketch_size)
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    names = list(pd.read_csv(csv_path, nrows=0).columns)
+    tasks = [(csv_path, start, end, names, columns, chunk_size, sketch_size, seed)
+             for seed, (start, end) in enumerate(_line_offsets(csv_path, workers))]
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        partials = list(pool.map(_summarize_range, tasks))
+    summary = partials[0]
+    for partial in partials[1:]:
+        summary.merge(partial)
+    return summary
+
+
+if __name__ == '__main__':
+    import shutil
+    import tempfile
+    import time
+
+    def compare(summary, frame, label):
+        describe_error = np.nanmax(np.abs(summary.describe().to_numpy() - frame.describe().to_numpy())
+                                   / np.maximum(np.abs(frame.describe().to_numpy()), 1e-12))
+        corr_error = np.max(np.abs(summary.corr().to_numpy() - frame.corr().to_numpy()))
+        print(f"{label}: describe max relative error {describe_error:.2e}, corr max abs error {corr_error:.2e}")
+
+    data = pd.read_csv('credit_scoring.csv')[NUMERIC_COLUMNS]
+    print(ColumnSummary(NUMERIC_COLUMNS).update(data).describe())
+    compare(ColumnSummary(NUMERIC_COLUMNS).update(data), data, "credit_scoring.csv, one chunk")
+    compare(summarize_csv('credit_scoring.csv', chunk_size=37), data, "credit_scoring.csv, chunks of 37")
+    parts = [ColumnSummary(NUMERIC_COLUMNS).update(part) for part in np.array_split(data, 7)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    compare(merged, data, "credit_scoring.csv, 7 merged partial summaries")
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        large_path = os.path.join(tmp_dir, 'credit_scoring_2m.csv')
+        rng = np.random.default_rng(0)
+        large = data.sample(2_000_000, replace=True, random_state=0, ignore_index=True)
+        large['Loan Amount'] = large['Loan Amount'] + rng.integers(-1000, 1000, len(large))
+        large.to_csv(large_path, index=False)
+        for workers in [1, 4]:
+            start = time.perf_counter()
+            summary = summarize_csv(large_path, workers=workers)
+            seconds = time.perf_counter() - start
+            compare(summary, large, f"2M rows, {workers} worker(s), {seconds:.1f}s")
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,89 @@
+"""Parity of the committed segment_table.json with the pickled KMeans model.
+
+Reads the table and the model; never rewrites either.
+
+    python -m pytest test_segment_table.py
+"""
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring import encode_categoricals, score_frame
+from segment_table import MISSING, SegmentTable, load_segment_table
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLE_PATH = os.path.join(HERE, 'segment_table.json')
+# Well above sklearn's rounding near a midpoint (about 1e-13), well below the 1e-9 probes
+BOUNDARY_TOLERANCE = 1e-10
+
+
+@pytest.fixture(scope='module')
+def kmeans_model():
+    with open(os.path.join(HERE, 'kmeans_credit_model.pkl'), 'rb') as model_file:
+        return pickle.load(model_file)
+
+
+@pytest.fixture(scope='module')
+def table():
+    return load_segment_table(TABLE_PATH)
+
+
+def test_committed_table_matches_the_model(kmeans_model):
+    with open(TABLE_PATH) as f:
+        committed = json.load(f)
+    exported = SegmentTable.from_kmeans(kmeans_model).to_dict()
+    assert committed['labels'] == exported['labels']
+    assert committed['cluster_ids'] == exported['cluster_ids']
+    np.testing.assert_allclose(committed['centroids'], exported['centroids'], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(committed['boundaries'], exported['boundaries'], rtol=0, atol=1e-9)
+
+
+def test_committed_table_ends_with_newline():
+    with open(TABLE_PATH, 'rb') as f:
+        assert f.read().endswith(b'\n')
+
+
+def _scores(table):
+    data = encode_categoricals(pd.read_csv(os.path.join(HERE, 'credit_scoring.csv')))
+    rng = np.random.default_rng(0)
+    return {
+        'credit_scoring.csv': score_frame(data),
+        'uniform': rng.uniform(-100, 1200, 200_000),
+        'boundaries +/- 1e-9': np.concatenate([table.boundaries + 1e-9, table.boundaries - 1e-9]),
+    }
+
+
+def test_cluster_matches_kmeans_predict(table, kmeans_model):
+    # Points within a few ulps of a midpoint depend on the rounding of sklearn's
+    # squared-distance formula, so they are left out
+    for name, scores in _scores(table).items():
+        near = np.abs(scores[:, None] - table.boundaries).min(axis=1) < BOUNDARY_TOLERANCE
+        scores = scores[~near]
+        expected = kmeans_model.predict(pd.DataFrame({'Credit Score': scores}))
+        assert np.array_equal(table.cluster(scores), expected), name
+
+
+def test_scalar_lookup(table):
+    assert table.segment(0.0) == 'Very Low'
+    assert table.segment(1000.0) == 'Excellent'
+    assert isinstance(table.cluster(512.3), int)
+
+
+@pytest.mark.parametrize('score', [np.nan, np.inf, -np.inf])
+def test_non_finite_scores_raise(table, score):
+    with pytest.raises(ValueError):
+        table.segment(score)
+    with pytest.raises(ValueError):
+        table.interval([100.0, score])
+
+
+def test_non_finite_scores_coerce_to_missing(table):
+    scores = np.array([100.0, np.nan, 900.0, np.inf])
+    assert table.interval(scores, errors='coerce').tolist() == [0, MISSING, 3, MISSING]
+    assert table.segment(scores, errors='coerce').tolist() == ['Very Low', None, 'Excellent', None]
+    assert table.cluster(scores, errors='coerce').tolist()[1] == -1
+    assert table.segment(np.nan, errors='coerce') is None
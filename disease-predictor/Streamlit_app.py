@@ -1,44 +1,57 @@
+import tempfile
+
 import streamlit as st
-import numpy as np
-import pickle
+
+from bulk_scoring import count_rows, score_csv
+from model_registry import ModelRegistry
+from prediction_cache import CachedPrediction, PredictionCache, symptom_bitmask
+from svm_engine import SparseRBFEngine, SymptomSession
+from symptom_catalogue import show_catalogue
+from symptom_index import SymptomIndex
+
+
+# One registry per process, shared by every session. It loads the pickles once
+# and swaps in a fresh bundle when the files change after a retrain.
+@st.cache_resource
+def load_registry():
+    return ModelRegistry()
+
 
 # Load the trained SVM model, scaler, and label encoder
-with open('svm_model.pkl', 'rb') as f:
-    svm_model = pickle.load(f)
-
-with open('scaler.pkl', 'rb') as f:
-    scaler = pickle.load(f)
-
-with open('label_encoder.pkl', 'rb') as f:
-    label_encoder = pickle.load(f)
-
-# Define the actual symptom names from the dataset and sort them alphabetically
-symptom_names = sorted([
-    'itching', 'skin rash', 'nodal skin eruptions', 'continuous sneezing', 'shivering', 'chills', 'joint pain',
-    'stomach pain', 'acidity', 'ulcers on tongue', 'muscle wasting', 'vomiting', 'burning micturition', 
-    'spotting urination', 'fatigue', 'weight gain', 'anxiety', 'cold hands and feet', 'mood swings', 
-    'weight loss', 'restlessness', 'lethargy', 'patches in throat', 'irregular sugar level', 'cough', 
-    'high fever', 'sunken eyes', 'breathlessness', 'sweating', 'dehydration', 'indigestion', 'headache', 
-    'yellowish skin', 'dark urine', 'nausea', 'loss of appetite', 'pain behind the eyes', 'back pain', 
-    'constipation', 'abdominal pain', 'diarrhoea', 'mild fever', 'yellow urine', 'yellowing of eyes', 
-    'acute liver failure', 'fluid overload', 'swelling of stomach', 'swelled lymph nodes', 'malaise', 
-    'blurred and distorted vision', 'phlegm', 'throat irritation', 'redness of eyes', 'sinus pressure', 
-    'runny nose', 'congestion', 'chest pain', 'weakness in limbs', 'fast heart rate', 'pain during bowel movements', 
-    'pain in anal region', 'bloody stool', 'irritation in anus', 'neck pain', 'dizziness', 'cramps', 
-    'bruising', 'obesity', 'swollen legs', 'swollen blood vessels', 'puffy face and eyes', 'enlarged thyroid', 
-    'brittle nails', 'swollen extremities', 'excessive hunger', 'extra-marital contacts', 'drying and tingling lips', 
-    'slurred speech', 'knee pain', 'hip joint pain', 'muscle weakness', 'stiff neck', 'swelling joints', 
-    'movement stiffness', 'spinning movements', 'loss of balance', 'unsteadiness', 'weakness of one body side', 
-    'loss of smell', 'bladder discomfort', 'foul smell of urine', 'continuous feel of urine', 'passage of gases', 
-    'internal itching', 'toxic look (typhos)', 'depression', 'irritability', 'muscle pain', 'altered sensorium', 
-    'red spots over body', 'belly pain', 'abnormal menstruation', 'dischromic patches', 'watering from eyes', 
-    'increased appetite', 'polyuria', 'family history', 'mucoid sputum', 'rusty sputum', 'lack of concentration', 
-    'visual disturbances', 'receiving blood transfusion', 'receiving unsterile injections', 'coma', 
-    'stomach bleeding', 'distention of abdomen', 'history of alcohol consumption', 'fluid overload (duplicate)', 
-    'blood in sputum', 'prominent veins on calf', 'palpitations', 'painful walking', 'pus-filled pimples', 
-    'blackheads', 'scarring', 'skin peeling', 'silver-like dusting', 'small dents in nails', 'inflammatory nails', 
-    'blister', 'red sore around nose', 'yellow crust ooze'
-])
+model_registry = load_registry()
+bundle = model_registry.get()
+
+
+# The inference engine is rebuilt only when the registry hands out a new model version
+@st.cache_resource(max_entries=1)
+def load_engine(version, _bundle):
+    return SparseRBFEngine.from_bundle(_bundle)
+
+
+engine = load_engine(bundle.version, bundle)
+
+
+# Predictions shared by all sessions, keyed by the selected symptom set
+@st.cache_resource
+def load_prediction_cache():
+    return PredictionCache(capacity=4096)
+
+
+prediction_cache = load_prediction_cache()
+
+
+# Symptom names come from the model's training header plus symptom_synonyms.csv,
+# so they always line up with the columns the model was trained on
+@st.cache_resource(max_entries=1)
+def load_symptom_index(version, _bundle):
+    return SymptomIndex.from_feature_names(_bundle.scaler.feature_names_in_)
+
+
+symptom_index = load_symptom_index(bundle.version, bundle)
+
+# Column index of each symptom, and the names sorted alphabetically for display
+symptom_columns = symptom_index.column_of
+symptom_names = sorted(symptom_index.display_names)
 
 # Streamlit UI Enhancements
 st.markdown(
@@ -61,16 +74,6 @@ st.markdown(
         border-radius: 12px;
         font-weight: bold;
     }
-    .symptom-col {
-        font-size: 14px;
-        font-family: 'Arial', sans-serif;
-        color: #333;
-        background-color: #fff;
-        border: 1px solid #ddd;
-        padding: 10px;
-        margin: 5px;
-        border-radius: 10px;
-    }
     .welcome {
         font-family: 'Comic Sans MS', cursive, sans-serif;
         color: #3f51b5;
@@ -93,39 +96,88 @@ st.markdown("""
             <br>
             Please select your symptoms from the list below or use the search feature to quickly find them. 
             <br>
-            After selecting, click the "Predict" button in the sidebar to get your results! 🚀
+            As you select symptoms, the sidebar updates your results live! 🚀
         </p>
     </div>
 """, unsafe_allow_html=True)
 
+
+def add_symptom(symptom):
+    if symptom not in st.session_state.selected_symptoms:
+        st.session_state.selected_symptoms = st.session_state.selected_symptoms + [symptom]
+
+
+# Typo-tolerant search that also knows synonyms ("diarrhea", "shortness of breath")
+symptom_query = st.text_input("🩺 Describe a symptom in your own words:")
+if symptom_query:
+    matches = symptom_index.search(symptom_query, limit=6)
+    if not matches:
+        st.caption("No matching symptom found.")
+    for match_column, match in zip(st.columns(3) * 2, matches):
+        match_column.button(f"➕ {match.display_name}", key=f"add_{match.column}",
+                            on_click=add_symptom, args=(match.display_name,))
+
 # Multiselect widget to choose symptoms
+if 'selected_symptoms' not in st.session_state:
+    st.session_state.selected_symptoms = []
 selected_symptoms = st.multiselect(
-    "🔎 Search and select your symptoms:", symptom_names)
+    "🔎 Search and select your symptoms:", symptom_names, key='selected_symptoms')
 
-# Display the list of symptoms in alphabetical order, in 3 columns
+# Display the list of symptoms in alphabetical order, in 3 columns. The catalogue is
+# built once and filtered in the browser, so each rerun sends a single element.
 st.write("### Available symptoms:")
-col1, col2, col3 = st.columns(3)
-
-# Split the symptoms evenly across the 3 columns and apply styling
-for i, symptom in enumerate(symptom_names):
-    if i % 3 == 0:
-        col1.markdown(f"<div class='symptom-col'>{symptom}</div>", unsafe_allow_html=True)
-    elif i % 3 == 1:
-        col2.markdown(f"<div class='symptom-col'>{symptom}</div>", unsafe_allow_html=True)
-    else:
-        col3.markdown(f"<div class='symptom-col'>{symptom}</div>", unsafe_allow_html=True)
+show_catalogue(symptom_names)
+
+# Score a whole file of patients shaped like Testing.csv
+st.write("### Score a file of patients:")
+uploaded_file = st.file_uploader("📄 Upload a CSV with one column per symptom (0 or 1)", type="csv")
+if uploaded_file is not None and st.button("Score file"):
+    total_rows = count_rows(uploaded_file)
+    progress_bar = st.progress(0.0, text=f"Scoring {total_rows} patients...")
 
-# Move the prediction button to the sidebar
+    def show_progress(rows_done):
+        progress_bar.progress(min(rows_done / max(total_rows, 1), 1.0), text=f"Scored {rows_done} of {total_rows} patients")
+
+    try:
+        # Results are streamed to a temporary file, one chunk at a time
+        with tempfile.TemporaryFile('w+', newline='') as results:
+            scored_rows = score_csv(uploaded_file, engine, list(bundle.scaler.feature_names_in_), results,
+                                    progress=show_progress)
+            results.seek(0)
+            st.success(f"Scored {scored_rows} patients.")
+            st.download_button("⬇️ Download predictions", results.read(), file_name="predictions.csv", mime="text/csv")
+    except ValueError as exc:
+        st.error(f"Could not score this file: {exc}")
+
+# Each session keeps its distances to the support vectors and only applies the
+# symptoms that were added or removed since the last rerun
+if st.session_state.get('symptom_session') is None or st.session_state.symptom_session.engine is not engine:
+    st.session_state.symptom_session = SymptomSession(engine)
+symptom_session = st.session_state.symptom_session
+active_columns = [symptom_columns[symptom] for symptom in selected_symptoms]
+symptom_session.sync(active_columns)
+
+
+def predict_selection():
+    return CachedPrediction(label=engine.label_for(symptom_session.predict()), scores=symptom_session.scores())
+
+
+# Live prediction panel in the sidebar
 with st.sidebar:
     if len(selected_symptoms) < 3:
         st.warning("⚠️Select at least 3 symptoms⚠️")
     else:
-        if st.button('Predict Now! 🚀'):
-            # Convert the selected symptoms into binary form (1 if selected, else 0)
-            symptoms_input = [1 if symptom in selected_symptoms else 0 for symptom in symptom_names]
-            
-            symptoms_array = np.array(symptoms_input).reshape(1, -1)
-            symptoms_scaled = scaler.transform(symptoms_array)
-            prediction = svm_model.predict(symptoms_scaled)
-            predicted_disease = label_encoder.inverse_transform(prediction)[0]
-            st.sidebar.success(f"⚕️ Predicted Disease: **{predicted_disease}**")
+        # Symptom sets other users already scored are answered from the shared cache
+        cached = prediction_cache.get_or_compute(symptom_bitmask(active_columns), bundle.version, predict_selection)
+        st.success(f"⚕️ Current best guess: **{cached.label}**")
+
+        st.write("#### Top matches")
+        for rank, (disease, votes, score) in enumerate(engine.rank(cached.scores, 5), start=1):
+            st.write(f"{rank}. {engine.label_for(disease)} ({votes}/{len(engine.classes) - 1} votes)")
+
+    # Load time and memory of the shared model artifacts
+    with st.expander("Model info"):
+        st.caption(f"Model version `{bundle.version}`, reloaded {model_registry.reload_count} time(s)")
+        st.table(model_registry.report())
+        st.caption("Prediction cache")
+        st.json(prediction_cache.stats())
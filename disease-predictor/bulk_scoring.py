@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Optional columns copied from the input file into the results
+PASSTHROUGH_COLUMNS = ['prognosis']
+
+
+def read_header(source):
+    """Column names of a CSV, with duplicates renamed the way pandas does (``fluid_overload.1``)."""
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return [str(column).strip() for column in header]
+
+
+def match_columns(header, feature_names):
+    """Check a CSV header against the training columns by name, not by position."""
+    missing = [name for name in feature_names if name not in header]
+    if missing:
+        raise ValueError(f"Missing {len(missing)} symptom column(s): {', '.join(missing[:10])}")
+    passthrough = [name for name in PASSTHROUGH_COLUMNS if name in header]
+    return list(feature_names), passthrough
+
+
+def count_rows(source):
+    """Number of data rows, used to size the progress bar."""
+    if hasattr(source, 'getvalue'):
+        lines = source.getvalue().count(b'\n')
+    else:
+        with open(source, 'rb') as f:
+            lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+    return max(lines - 1, 0)
+
+
+def score_csv(source, engine, feature_names, output, chunk_size=5000, progress=None):
+    """Score a CSV shaped like Testing.csv chunk by chunk and append the results to ``output``.
+
+    Only the symptom columns (and ``prognosis`` if present) are parsed, as int8,
+    ``chunk_size`` rows at a time, so memory stays bounded by the chunk size rather
+    than the file size. ``progress`` is called with the number of rows scored so far.
+    Returns the total number of rows scored.
+    """
+    header = read_header(source)
+    symptom_columns, passthrough = match_columns(header, feature_names)
+    dtypes = {name: np.int8 for name in symptom_columns}
+
+    scored = 0
+    reader = pd.read_csv(source, usecols=symptom_columns + passthrough, dtype=dtypes, chunksize=chunk_size)
+    for chunk in reader:
+        # Reorder the columns into training order before scoring
+        predictions = engine.predict(chunk[symptom_columns].to_numpy())
+        result = pd.DataFrame({'row': np.arange(scored + 1, scored + len(chunk) + 1)})
+        for name in passthrough:
+            result[name] = chunk[name].to_numpy()
+        result['predicted_disease'] = engine.label_for(predictions)
+        result.to_csv(output, header=scored == 0, index=False)
+        scored += len(chunk)
+        if progress is not None:
+            progress(scored)
+    return scored
+
+
+if __name__ == '__main__':
+    # Command-line bulk scoring: python bulk_scoring.py patients.csv predictions.csv
+    import sys
+    import time
+    from model_registry import ModelRegistry
+    from svm_engine import SparseRBFEngine
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python bulk_scoring.py <input.csv> <output.csv>")
+    bundle = ModelRegistry().get()
+    engine = SparseRBFEngine.from_bundle(bundle)
+    start = time.perf_counter()
+    with open(sys.argv[2], 'w', newline='') as out:
+        rows = score_csv(sys.argv[1], engine, list(bundle.scaler.feature_names_in_), out)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
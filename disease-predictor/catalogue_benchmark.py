@@ -0,0 +1,60 @@
+"""Count the Streamlit messages and bytes the symptom catalogue sends per rerun.
+
+Renders the catalogue the old way (one markdown element per symptom across three
+columns) and the cached component way, and also measures a full rerun of
+Streamlit_app.py:
+
+    python catalogue_benchmark.py
+"""
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+
+def legacy_catalogue():
+    import streamlit as st
+    from symptom_index import SymptomIndex
+    symptom_names = sorted(SymptomIndex.from_csv_header().display_names)
+
+    st.write("### Available symptoms:")
+    col1, col2, col3 = st.columns(3)
+    for i, symptom in enumerate(symptom_names):
+        column = (col1, col2, col3)[i % 3]
+        column.markdown(f"<div class='symptom-col'>{symptom}</div>", unsafe_allow_html=True)
+
+
+def cached_catalogue():
+    import streamlit as st
+    from symptom_index import SymptomIndex
+    symptom_names = sorted(SymptomIndex.from_csv_header().display_names)
+    from symptom_catalogue import show_catalogue
+
+    st.write("### Available symptoms:")
+    show_catalogue(symptom_names)
+
+
+def measure(app):
+    """Messages and bytes of the second rerun (caches are warm by then)."""
+    sent = []
+    original = ForwardMsgQueue.enqueue
+
+    def counting_enqueue(queue, msg):
+        if msg.HasField('delta'):
+            sent.append(msg.ByteSize())
+        return original(queue, msg)
+
+    ForwardMsgQueue.enqueue = counting_enqueue
+    try:
+        app.run(timeout=60)
+        sent.clear()
+        app.run(timeout=60)
+    finally:
+        ForwardMsgQueue.enqueue = original
+    return len(sent), sum(sent)
+
+
+if __name__ == '__main__':
+    for name, app in [('legacy catalogue', AppTest.from_function(legacy_catalogue)),
+                      ('cached catalogue', AppTest.from_function(cached_catalogue)),
+                      ('full app rerun', AppTest.from_file('Streamlit_app.py'))]:
+        messages, size = measure(app)
+        print(f"{name:<18} {messages:>4} delta messages, {size / 1024:7.1f} KB per rerun")
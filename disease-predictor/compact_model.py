@@ -0,0 +1,163 @@
+"""Compact export of the disease SVM for serving.
+
+The pickled ``SVC`` stores its support vectors as float64 rows of standard-scaled
+values, although each one is a scaled 0/1 symptom vector. The compact artifact
+keeps instead:
+
+* the support vectors as bit-packed 0/1 rows (17 bytes each),
+* the scaler mean and scale, from which the scaled vectors are rebuilt exactly,
+* the precomputed squared norms used by ``SparseRBFEngine`` (``base_dist``),
+* the dual coefficients in a smaller float type, after merging support vectors
+  of the same class that have identical (or, optionally, near-identical) rows.
+
+Support vectors with identical rows in the same class always produce the same
+kernel value, so merging them by adding their dual coefficients is lossless.
+``prune_hamming`` also merges rows within that Hamming distance, which is not
+lossless; the CLI reports how far predictions then drift from the pickle:
+
+    python compact_model.py --coef-dtype float32 --prune-hamming 1
+"""
+import numpy as np
+
+from svm_engine import SparseRBFEngine
+
+FORMAT_VERSION = 1
+
+
+def binary_support_vectors(svm_model, scaler):
+    """Undo the scaling of the support vectors and check they are 0/1 rows."""
+    raw = svm_model.support_vectors_ * scaler.scale_ + scaler.mean_
+    bits = np.rint(raw)
+    if np.abs(raw - bits).max() > 1e-6 or not np.all((bits == 0) | (bits == 1)):
+        raise ValueError("Support vectors are not scaled 0/1 symptom rows")
+    return bits.astype(np.uint8)
+
+
+def merge_support_vectors(bits, dual_coef, n_support, prune_hamming=0):
+    """Merge support vectors of the same class whose rows differ in at most ``prune_hamming`` bits.
+
+    The merged vector keeps the row of the first member and the sum of the members'
+    dual coefficients. Returns the new ``(bits, dual_coef, n_support)``.
+    """
+    keep, columns, new_n_support = [], [], []
+    start = 0
+    for count in n_support:
+        representatives = []  # indices into bits of the vectors kept for this class
+        for index in range(start, start + count):
+            for position, rep in enumerate(representatives):
+                if np.count_nonzero(bits[index] != bits[rep]) <= prune_hamming:
+                    columns[len(keep) - len(representatives) + position] += dual_coef[:, index]
+                    break
+            else:
+                representatives.append(index)
+                keep.append(index)
+                columns.append(dual_coef[:, index].astype(np.float64))
+        new_n_support.append(len(representatives))
+        start += count
+    return bits[keep], np.column_stack(columns), np.array(new_n_support, dtype=np.int32)
+
+
+def export_compact(svm_model, scaler, label_encoder, path, coef_dtype='float32', prune_hamming=0):
+    """Write the compact artifact to ``path`` (an ``.npz`` file) and return the number of support vectors kept."""
+    if svm_model.kernel != 'rbf':
+        raise ValueError(f"Only RBF models can be exported, got {svm_model.kernel!r}")
+    bits, dual_coef, n_support = merge_support_vectors(
+        binary_support_vectors(svm_model, scaler), svm_model.dual_coef_, svm_model.n_support_, prune_hamming)
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+    # Squared distance of each support vector to the scaled all-zero input
+    diff = -mean / scale - (bits - mean) / scale
+    base_dist = np.einsum('ij,ij->i', diff, diff)
+
+    np.savez_compressed(
+        path,
+        format_version=np.int32(FORMAT_VERSION),
+        n_features=np.int32(bits.shape[1]),
+        packed_support_vectors=np.packbits(bits, axis=1),
+        mean=mean,
+        scale=scale,
+        base_dist=base_dist,
+        gamma=np.float64(svm_model._gamma),
+        classes=np.asarray(svm_model.classes_),
+        n_support=n_support,
+        dual_coef=dual_coef.astype(coef_dtype),
+        intercept=np.asarray(svm_model.intercept_, dtype=np.float64),
+        label_names=np.asarray(label_encoder.inverse_transform(svm_model.classes_), dtype=str),
+    )
+    return len(bits)
+
+
+def load_compact(path):
+    """Build a ``SparseRBFEngine`` straight from a compact artifact, without sklearn."""
+    with np.load(path, allow_pickle=False) as data:
+        if int(data['format_version']) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model version {int(data['format_version'])}")
+        mean, scale = data['mean'], data['scale']
+        bits = np.unpackbits(data['packed_support_vectors'], axis=1, count=int(data['n_features']))
+        return SparseRBFEngine.from_arrays(
+            support_vectors=(bits - mean) / scale,
+            mean=mean,
+            scale=scale,
+            gamma=data['gamma'],
+            classes=data['classes'],
+            n_support=data['n_support'],
+            dual_coef=data['dual_coef'],
+            intercept=data['intercept'],
+            label_names=data['label_names'],
+            base_dist=data['base_dist'],
+        )
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import subprocess
+    import sys
+    import time
+    import pandas as pd
+    from model_registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Export svm_model.pkl as a compact artifact")
+    parser.add_argument('--output', default='svm_model.compact.npz')
+    parser.add_argument('--coef-dtype', default='float32', choices=['float64', 'float32', 'float16'])
+    parser.add_argument('--prune-hamming', type=int, default=0,
+                        help="Also merge same-class support vectors differing in up to this many symptoms")
+    args = parser.parse_args()
+
+    bundle = ModelRegistry().get()
+    kept = export_compact(bundle.svm_model, bundle.scaler, bundle.label_encoder, args.output,
+                          args.coef_dtype, args.prune_hamming)
+
+    pickle_bytes = sum(os.path.getsize(stats.path) for stats in bundle.stats.values())
+    # Cold load: a fresh interpreter that loads the artifacts and is ready to predict
+    cold_pickle = ("import pickle; from svm_engine import SparseRBFEngine; "
+                   "m, s, l = [pickle.load(open(p, 'rb')) for p in ('svm_model.pkl', 'scaler.pkl', 'label_encoder.pkl')]; "
+                   "SparseRBFEngine(m, s, l)")
+    cold_compact = f"from compact_model import load_compact; load_compact({args.output!r})"
+    cold_seconds = {}
+    for name, code in [('pickles', cold_pickle), ('compact', cold_compact)]:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-W', 'ignore', '-c', code], check=True)
+        cold_seconds[name] = time.perf_counter() - start
+    engine = load_compact(args.output)
+
+    # Agreement with the pickled model on the bundled data and on random sparse symptom sets
+    reference = SparseRBFEngine.from_bundle(bundle)
+    rng = np.random.default_rng(0)
+    random_rows = np.zeros((20000, reference.n_features))
+    for row, k in zip(random_rows, rng.integers(1, 9, len(random_rows))):
+        row[rng.choice(reference.n_features, k, replace=False)] = 1
+    inputs = {
+        'Testing.csv': pd.read_csv('Testing.csv').iloc[:, :-1].to_numpy(),
+        'data.csv': pd.read_csv('data.csv').iloc[:, :-1].to_numpy(),
+        'random sparse': random_rows,
+    }
+
+    print(f"Support vectors: {reference.n_support_vectors} -> {kept}")
+    print(f"Size: pickles {pickle_bytes / 1024:.1f} KB -> compact {os.path.getsize(args.output) / 1024:.1f} KB "
+          f"({pickle_bytes / os.path.getsize(args.output):.1f}x smaller)")
+    print(f"Cold load in a new process: pickles {cold_seconds['pickles']:.2f} s -> compact {cold_seconds['compact']:.2f} s")
+    for name, X in inputs.items():
+        agreement = np.mean(engine.predict(X) == reference.predict(X))
+        print(f"Agreement with svm_model.pkl on {name}: {agreement * 100:.3f}% ({len(X)} rows)")
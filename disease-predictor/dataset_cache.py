@@ -0,0 +1,217 @@
+"""Bit-packed, memory-mapped cache of a symptom CSV such as data.csv.
+
+The CSV is converted once into a single ``.symcache`` file:
+
+    magic (8 bytes) | header length (uint32) | JSON header | padding
+    packed symptom bits, one row of ceil(n_features / 8) bytes per patient
+    encoded labels (int16 or int32), aligned to 64 bytes
+
+The JSON header holds the feature names, the class names, a hash of the CSV
+header row (the schema hash) and the size, mtime and sha256 of the source CSV.
+Loading maps the file with ``numpy.memmap`` without copying; the cache is rebuilt
+automatically when the CSV content or schema changes.
+"""
+import csv
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'SYMCACHE'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+LABEL_COLUMN = 'prognosis'
+
+
+def cache_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.symcache'
+
+
+def schema_hash(csv_path):
+    """Hash of the raw CSV header row; any renamed, added or reordered column changes it."""
+    with open(csv_path, newline='') as f:
+        columns = next(csv.reader(f), [])
+    return hashlib.sha256('\x1f'.join(columns).encode()).hexdigest()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SymptomDataset:
+    """A loaded cache: packed bits and labels are read-only memory maps of the cache file."""
+
+    def __init__(self, path, header, packed, labels):
+        self.path = path
+        self.header = header
+        self.packed = packed
+        self.labels = labels
+        self.feature_names = header['feature_names']
+        self.classes = np.array(header['classes'], dtype=object)
+
+    @property
+    def n_rows(self):
+        return self.header['n_rows']
+
+    @property
+    def n_features(self):
+        return self.header['n_features']
+
+    def unpack(self, rows=slice(None)):
+        """0/1 symptom matrix as uint8 (8x smaller than the int64 columns pandas produces)."""
+        return np.unpackbits(self.packed[rows], axis=1, count=self.n_features)
+
+    def to_frame(self, rows=slice(None)):
+        return pd.DataFrame(self.unpack(rows), columns=self.feature_names)
+
+    def label_names(self, rows=slice(None)):
+        return self.classes[self.labels[rows]]
+
+
+def build_cache(csv_path, cache_path=None, chunk_size=50000):
+    """Convert ``csv_path`` into a cache file, reading the CSV in chunks."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    columns = list(pd.read_csv(csv_path, nrows=0).columns)
+    if columns[-1] != LABEL_COLUMN:
+        raise ValueError(f"Expected '{LABEL_COLUMN}' as the last column of {csv_path}")
+    feature_names = columns[:-1]
+    dtypes = {name: np.uint8 for name in feature_names}
+
+    # Pack the symptom bits into a scratch file and keep the raw labels, which are small
+    n_rows = 0
+    raw_labels = []
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    with tempfile.TemporaryFile(dir=directory) as body:
+        for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_size):
+            bits = chunk[feature_names].to_numpy()
+            if bits.max(initial=0) > 1:
+                raise ValueError(f"{csv_path} has symptom values other than 0 and 1")
+            body.write(np.packbits(bits, axis=1).tobytes())
+            raw_labels.append(chunk[LABEL_COLUMN].astype(str).to_numpy())
+            n_rows += len(chunk)
+
+        # Same class order as LabelEncoder: sorted unique names
+        classes, labels = np.unique(np.concatenate(raw_labels) if raw_labels else np.array([], dtype=str),
+                                    return_inverse=True)
+        label_dtype = np.int16 if len(classes) < np.iinfo(np.int16).max else np.int32
+        labels = labels.astype(label_dtype)
+
+        stat = os.stat(csv_path)
+        header = {
+            'format_version': FORMAT_VERSION,
+            'n_rows': n_rows,
+            'n_features': len(feature_names),
+            'row_bytes': (len(feature_names) + 7) // 8,
+            'label_dtype': np.dtype(label_dtype).name,
+            'feature_names': feature_names,
+            'classes': [str(c) for c in classes],
+            'schema_hash': schema_hash(csv_path),
+            'source': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _file_sha256(csv_path)},
+        }
+        header_bytes = json.dumps(header).encode()
+        data_offset = _aligned(len(MAGIC) + 4 + len(header_bytes))
+        labels_offset = _aligned(data_offset + n_rows * header['row_bytes'])
+
+        # Write next to the final path and rename, so readers never see a half-written cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+                out.write(b'\0' * (data_offset - out.tell()))
+                body.seek(0)
+                for block in iter(lambda: body.read(1 << 20), b''):
+                    out.write(block)
+                out.write(b'\0' * (labels_offset - out.tell()))
+                out.write(labels.tobytes())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return cache_path
+
+
+def read_header(cache_path):
+    with open(cache_path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{cache_path} is not a symptom cache")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+    header['_header_end'] = len(MAGIC) + 4 + length
+    return header
+
+
+def open_cache(cache_path):
+    header = read_header(cache_path)
+    data_offset = _aligned(header['_header_end'])
+    labels_offset = _aligned(data_offset + header['n_rows'] * header['row_bytes'])
+    n_rows = header['n_rows']
+    if n_rows == 0:
+        packed = np.zeros((0, header['row_bytes']), dtype=np.uint8)
+        labels = np.zeros(0, dtype=header['label_dtype'])
+    else:
+        packed = np.memmap(cache_path, dtype=np.uint8, mode='r', offset=data_offset,
+                           shape=(n_rows, header['row_bytes']))
+        labels = np.memmap(cache_path, dtype=header['label_dtype'], mode='r', offset=labels_offset, shape=(n_rows,))
+    return SymptomDataset(cache_path, header, packed, labels)
+
+
+def is_fresh(csv_path, header):
+    """True if the cache still describes ``csv_path``."""
+    if header.get('format_version') != FORMAT_VERSION:
+        return False
+    source = header['source']
+    stat = os.stat(csv_path)
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns != source['mtime_ns'] and _file_sha256(csv_path) != source['sha256']:
+        return False
+    return schema_hash(csv_path) == header['schema_hash']
+
+
+def load_dataset(csv_path, cache_path=None):
+    """Load ``csv_path`` through its cache, building or rebuilding the cache when needed."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    try:
+        if is_fresh(csv_path, read_header(cache_path)):
+            return open_cache(cache_path)
+    except (OSError, ValueError, KeyError):
+        pass
+    build_cache(csv_path, cache_path)
+    return open_cache(cache_path)
+
+
+if __name__ == '__main__':
+    # Compare the cache with parsing the CSV: python dataset_cache.py [data.csv]
+    import sys
+    import time
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data.csv'
+    start = time.perf_counter()
+    frame = pd.read_csv(csv_path)
+    csv_seconds = time.perf_counter() - start
+    csv_bytes = int(frame.memory_usage(deep=True).sum())
+
+    load_dataset(csv_path)  # make sure the cache exists
+    start = time.perf_counter()
+    dataset = load_dataset(csv_path)
+    cache_seconds = time.perf_counter() - start
+    packed_bytes = dataset.packed.nbytes + dataset.labels.nbytes
+
+    same = (np.array_equal(dataset.unpack(), frame.iloc[:, :-1].to_numpy())
+            and np.array_equal(dataset.label_names(), frame.iloc[:, -1].astype(str).to_numpy()))
+    print(f"{dataset.n_rows} rows x {dataset.n_features} symptoms, identical to CSV: {same}")
+    print(f"CSV:   {csv_seconds * 1000:.1f} ms, {csv_bytes / 1024:.0f} KB in memory")
+    print(f"Cache: {cache_seconds * 1000:.1f} ms, {packed_bytes / 1024:.0f} KB mapped ({os.path.getsize(dataset.path) / 1024:.0f} KB file)")
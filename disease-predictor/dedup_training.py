@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def collapse_duplicates(X, y):
+    """Collapse identical (symptom vector, label) rows into unique rows with counts.
+
+    Returns ``(X_unique, y_unique, counts)`` with rows kept in order of first
+    appearance. libsvm scales C per sample by its weight, which is the box
+    constraint of the merged duplicates, so ``SVC`` fit on the unique rows with
+    ``sample_weight=counts`` matches the fit on every copy only if its kernel is
+    the same too: pass ``gamma=scale_gamma(X_unique, counts)``. The default
+    ``gamma='scale'`` would take the variance of the unweighted unique rows.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    # Pack each 0/1 row into bytes and append the label, so a row is one short byte key
+    packed = np.packbits(X.astype(np.uint8, copy=False), axis=1)
+    label_bytes = np.ascontiguousarray(y.astype(np.int64)).view(np.uint8).reshape(len(y), -1)
+    keys = np.hstack([packed, label_bytes])
+    _, first_index, counts = np.unique(keys, axis=0, return_index=True, return_counts=True)
+    order = np.argsort(first_index)
+    keep = first_index[order]
+    return X[keep], y[keep], counts[order]
+
+
+def scale_gamma(X, counts):
+    """``gamma='scale'`` of the full data, from its unique rows and their counts.
+
+    sklearn uses ``1 / (n_features * X.var())`` with the variance over every
+    entry of the (scaled) training matrix; here each row counts ``counts`` times.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    weights = np.asarray(counts, dtype=np.float64)[:, None]
+    n_entries = weights.sum() * X.shape[1]
+    mean = (weights * X).sum() / n_entries
+    variance = (weights * (X - mean) ** 2).sum() / n_entries
+    return 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+
+
+def dedup_ratio(n_rows, n_unique):
+    return n_rows / max(n_unique, 1)
+
+
+if __name__ == '__main__':
+    # Compare full and duplicate-aware training on the same split as main.py
+    import time
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+    from dataset_cache import load_dataset
+
+    dataset = load_dataset('data.csv')
+    X = dataset.to_frame()
+    y = np.asarray(dataset.labels)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    testing = pd.read_csv('Testing.csv')
+    X_testing = testing[dataset.feature_names]
+
+    start = time.perf_counter()
+    full_scaler = StandardScaler().fit(X_train)
+    full_model = SVC(kernel='rbf', random_state=42).fit(full_scaler.transform(X_train), y_train)
+    full_seconds = time.perf_counter() - start
+
+    X_unique, y_unique, counts = collapse_duplicates(X_train.to_numpy(), y_train)
+    X_unique = pd.DataFrame(X_unique, columns=dataset.feature_names)
+    start = time.perf_counter()
+    dedup_scaler = StandardScaler().fit(X_unique, sample_weight=counts)
+    X_unique_scaled = dedup_scaler.transform(X_unique)
+    dedup_model = SVC(kernel='rbf', gamma=scale_gamma(X_unique_scaled, counts), random_state=42)
+    dedup_model.fit(X_unique_scaled, y_unique, sample_weight=counts)
+    dedup_seconds = time.perf_counter() - start
+
+    full_pred = full_model.predict(full_scaler.transform(X_testing))
+    dedup_pred = dedup_model.predict(dedup_scaler.transform(X_testing))
+    print(f"Training rows: {len(X_train)}, unique: {len(X_unique)} "
+          f"(dedup ratio {dedup_ratio(len(X_train), len(X_unique)):.1f}x)")
+    print(f"Fit time: full {full_seconds * 1000:.1f} ms, deduplicated {dedup_seconds * 1000:.1f} ms "
+          f"({full_seconds / dedup_seconds:.1f}x faster)")
+    print(f"gamma: full {full_model._gamma:.6f}, deduplicated {dedup_model._gamma:.6f}")
+    # Compare the pairwise (ovo) decision values; the ovr shape adds vote counts that flip on near-ties
+    for model in (full_model, dedup_model):
+        model.set_params(decision_function_shape='ovo')
+    decision_gap = np.abs(full_model.decision_function(full_scaler.transform(X_testing))
+                          - dedup_model.decision_function(dedup_scaler.transform(X_testing))).max()
+    print(f"Pairwise decision values max difference on Testing.csv: {decision_gap:.1e}")
+    print(f"Testing.csv predictions identical: {np.array_equal(full_pred, dedup_pred)}")
+    print(f"Held-out split predictions identical: "
+          f"{np.array_equal(full_model.predict(full_scaler.transform(X_test)), dedup_model.predict(dedup_scaler.transform(X_test)))}")
@@ -5,34 +5,43 @@ from sklearn.model_selection import train_test_split
 from sklearn.svm import SVC
 from sklearn.metrics import classification_report, accuracy_score
 
-# Load the dataset
+from dataset_cache import load_dataset
+from dedup_training import collapse_duplicates, dedup_ratio, scale_gamma
+
+# Load the dataset through its bit-packed cache (rebuilt automatically when the CSV changes)
 file_path = 'data.csv'  # Path to your CSV file
-data = pd.read_csv(file_path)
+dataset = load_dataset(file_path)
 
 # Get symptom names from the columns (ignoring the 'prognosis' column)
-symptom_names = list(data.columns[:-1])
+symptom_names = dataset.feature_names
 
 # Step 1: Data Preprocessing
-# Encode the target labels (prognosis)
+# The cache already stores the prognosis encoded in LabelEncoder's (sorted) class order
 label_encoder = LabelEncoder()
-data['prognosis'] = label_encoder.fit_transform(data['prognosis'])
+label_encoder.fit(dataset.classes)
 
-# Separate features and target label
-X = data.drop(columns=['prognosis'])
-y = data['prognosis']
+# Separate features and target label (symptoms unpacked as uint8 instead of int64)
+X = dataset.to_frame()
+y = pd.Series(dataset.labels, name='prognosis')
 
 # Split the data into training and testing sets (80% train, 20% test)
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# Feature scaling
+# Collapse duplicate training rows; each unique row is weighted by how often it occurs
+X_train_unique, y_train_unique, train_counts = collapse_duplicates(X_train.to_numpy(), y_train.to_numpy())
+X_train_unique = pd.DataFrame(X_train_unique, columns=symptom_names)
+print(f"Training rows: {len(X_train)}, unique: {len(X_train_unique)} "
+      f"(dedup ratio {dedup_ratio(len(X_train), len(X_train_unique)):.1f}x)")
+
+# Feature scaling (weighted, so mean and variance match the full training set)
 scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
+X_train_scaled = scaler.fit_transform(X_train_unique, sample_weight=train_counts)
 X_test_scaled = scaler.transform(X_test)
 
 # Step 2: Model Training
-# Train the SVM model with RBF kernel
-svm_model = SVC(kernel='rbf', random_state=42)
-svm_model.fit(X_train_scaled, y_train)
+# Train the SVM model with RBF kernel; gamma is what 'scale' gives on the full (weighted) training set
+svm_model = SVC(kernel='rbf', gamma=scale_gamma(X_train_scaled, train_counts), random_state=42)
+svm_model.fit(X_train_scaled, y_train_unique, sample_weight=train_counts)
 
 # Step 3: Model Evaluation
 # Make predictions on the test set
@@ -0,0 +1,195 @@
+"""Train and compare several disease model families on the same split.
+
+For every model the harness records accuracy on Testing.csv and on the held-out
+split of data.csv, fit time, single-row and batch prediction latency, pickled
+size and peak RSS. Each model runs in its own fresh process so peak RSS is not
+shared between them. The report is written as JSON:
+
+    python model_bakeoff.py                       # writes bakeoff_report.json
+    python model_bakeoff.py --output report.json --models rbf_svc bernoulli_nb
+"""
+import argparse
+import json
+import multiprocessing
+import pickle
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Set bits of every byte value, for NumPy versions without np.bitwise_count (added in 2.0)
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(packed):
+    """Number of set bits in each byte of a uint8 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed)
+    return _POPCOUNT[packed]
+
+
+class WeightedRBF:
+    """The RBF SVC trained the way main.py trains it: unique rows weighted by their counts."""
+
+    def fit(self, X, y):
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.svm import SVC
+        from dedup_training import collapse_duplicates, scale_gamma
+        X_unique, y_unique, counts = collapse_duplicates(np.asarray(X, dtype=np.uint8), y)
+        self.scaler_ = StandardScaler().fit(X_unique, sample_weight=counts)
+        X_scaled = self.scaler_.transform(X_unique)
+        self.svm_ = SVC(kernel='rbf', gamma=scale_gamma(X_scaled, counts), random_state=42)
+        self.svm_.fit(X_scaled, y_unique, sample_weight=counts)
+        return self
+
+    def predict(self, X):
+        return self.svm_.predict(self.scaler_.transform(X))
+
+
+class BitsetNearestNeighbor:
+    """1-nearest-neighbour by Hamming distance over bit-packed symptom rows."""
+
+    def fit(self, X, y):
+        from dedup_training import collapse_duplicates
+        # Identical rows only need to be stored once
+        X_unique, self.labels_, _ = collapse_duplicates(np.asarray(X, dtype=np.uint8), y)
+        self.packed_ = np.packbits(X_unique, axis=1)
+        return self
+
+    def predict(self, X):
+        packed = np.packbits(np.asarray(X, dtype=np.uint8), axis=1)
+        # XOR every query against every stored row and count the differing bits
+        distances = popcount(packed[:, np.newaxis, :] ^ self.packed_[np.newaxis, :, :]).sum(axis=2, dtype=np.int64)
+        return self.labels_[np.argmin(distances, axis=1)]
+
+
+class EngineModel:
+    """The trained RBF model served through SparseRBFEngine."""
+
+    def __init__(self, model):
+        self.model = model
+        self.engine = None
+
+    def fit(self, X, y):
+        from svm_engine import SparseRBFEngine
+        self.model.fit(X, y)
+        self.engine = SparseRBFEngine(self.model.svm_, self.model.scaler_)
+        return self
+
+    def predict(self, X):
+        return self.engine.predict(X)
+
+    def __getstate__(self):
+        # Only the engine is needed to serve predictions
+        return {'model': None, 'engine': self.engine}
+
+
+def build_model(name):
+    from sklearn.naive_bayes import BernoulliNB
+    from sklearn.svm import LinearSVC
+
+    if name == 'rbf_svc':
+        return WeightedRBF()
+    if name == 'rbf_svc_engine':
+        return EngineModel(WeightedRBF())
+    if name == 'linear_svc':
+        # 0/1 columns need no scaling here; liblinear converges far more slowly on standardized input
+        return LinearSVC(random_state=42)
+    if name == 'bernoulli_nb':
+        return BernoulliNB()
+    if name == 'bitset_nn':
+        return BitsetNearestNeighbor()
+    raise ValueError(f"Unknown model {name!r}")
+
+
+MODELS = ['rbf_svc', 'rbf_svc_engine', 'linear_svc', 'bernoulli_nb', 'bitset_nn']
+
+
+def time_per_call(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def evaluate(name, data_path='data.csv', testing_path='Testing.csv', batch_size=1000, repeats=50):
+    """Train and measure one model; meant to run in a fresh process."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from dataset_cache import load_dataset
+
+    dataset = load_dataset(data_path)
+    X = dataset.unpack()
+    y = np.asarray(dataset.labels)
+    # Same split as main.py
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    testing = pd.read_csv(testing_path)
+    X_testing = testing[dataset.feature_names].to_numpy(dtype=np.uint8)
+    y_testing = np.searchsorted(dataset.classes, testing['prognosis'].astype(str).to_numpy())
+
+    model = build_model(name)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    batch = X[np.random.default_rng(0).integers(0, len(X), batch_size)]
+    single = X_testing[:1]
+    single_seconds = time_per_call(lambda: model.predict(single), repeats)
+    batch_seconds = time_per_call(lambda: model.predict(batch), max(repeats // 10, 3))
+
+    return {
+        'model': name,
+        'accuracy_testing_csv': float(np.mean(model.predict(X_testing) == y_testing)),
+        'accuracy_holdout': float(np.mean(model.predict(X_test) == y_test)),
+        'fit_ms': fit_seconds * 1000,
+        'single_row_latency_us': single_seconds * 1e6,
+        'batch_size': batch_size,
+        'batch_latency_ms': batch_seconds * 1000,
+        'batch_us_per_row': batch_seconds / batch_size * 1e6,
+        'serialized_bytes': len(pickle.dumps(model)),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run(names, **kwargs):
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for name in names:
+        # A new process per model, so peak RSS and warm caches are not shared
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(evaluate, name, **kwargs).result())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Disease model bake-off")
+    parser.add_argument('--models', nargs='+', default=MODELS, choices=MODELS)
+    parser.add_argument('--output', default='bakeoff_report.json')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    results = run(args.models, batch_size=args.batch_size, repeats=args.repeats)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'model':<16}{'test acc':>9}{'fit ms':>9}{'1-row us':>10}{'batch us/row':>14}{'size KB':>9}{'RSS MB':>8}")
+    for r in results:
+        print(f"{r['model']:<16}{r['accuracy_testing_csv']:>9.3f}{r['fit_ms']:>9.1f}{r['single_row_latency_us']:>10.1f}"
+              f"{r['batch_us_per_row']:>14.2f}{r['serialized_bytes'] / 1024:>9.1f}{r['peak_rss_mb']:>8.1f}")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
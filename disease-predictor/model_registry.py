@@ -0,0 +1,167 @@
+import hashlib
+import importlib
+import os
+import pickle
+import pickletools
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+
+# Default artifact files written by the training notebook
+ARTIFACT_FILES = {
+    'svm_model': 'svm_model.pkl',
+    'scaler': 'scaler.pkl',
+    'label_encoder': 'label_encoder.pkl',
+}
+
+# Load statistics recorded for every artifact
+ArtifactStats = namedtuple('ArtifactStats', ['path', 'size_bytes', 'sha256', 'load_seconds', 'memory_bytes'])
+
+# One consistent set of artifacts; the registry swaps whole bundles, never single members
+ModelBundle = namedtuple('ModelBundle', ['svm_model', 'scaler', 'label_encoder', 'version', 'stats', 'loaded_at'])
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def import_pickle_modules(payload):
+    """Import the modules a pickle refers to, so measuring its load does not count the import of sklearn."""
+    strings = []
+    for opcode, arg, _ in pickletools.genops(payload):
+        if opcode.name == 'GLOBAL':
+            strings.append(arg.split(' ')[0])
+            module = strings[-1]
+        elif opcode.name == 'STACK_GLOBAL' and len(strings) >= 2:
+            module = strings[-2]
+        elif isinstance(arg, str):
+            strings.append(arg)
+            continue
+        else:
+            continue
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def load_artifact(path):
+    """Unpickle one artifact and measure how long it took and how much memory it holds."""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    import_pickle_modules(payload)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    obj = pickle.loads(payload)
+    load_seconds = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    stats = ArtifactStats(
+        path=path,
+        size_bytes=len(payload),
+        sha256=hashlib.sha256(payload).hexdigest(),
+        load_seconds=load_seconds,
+        memory_bytes=max(after - before, 0),
+    )
+    return obj, stats
+
+
+class ModelRegistry:
+    """Process-wide holder for the disease model artifacts.
+
+    The artifacts are loaded once and shared by every caller. ``get()`` stats the
+    files (at most once per ``check_interval`` seconds) and, when the mtime or size
+    changed and the content hash really differs, loads a complete new bundle and
+    swaps it in with a single assignment. Callers holding the old bundle keep a
+    consistent model/scaler/encoder triple until their next ``get()``.
+    """
+
+    def __init__(self, directory='.', files=None, check_interval=1.0):
+        self.directory = directory
+        self.files = dict(files or ARTIFACT_FILES)
+        self.check_interval = check_interval
+        self.reload_count = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._file_state = {}
+        self._last_check = 0.0
+
+    def _path(self, name):
+        return os.path.join(self.directory, self.files[name])
+
+    def _stat_signature(self):
+        signature = {}
+        for name in self.files:
+            st = os.stat(self._path(name))
+            signature[name] = (st.st_mtime_ns, st.st_size)
+        return signature
+
+    def _load_bundle(self):
+        artifacts, stats = {}, {}
+        for name in self.files:
+            artifacts[name], stats[name] = load_artifact(self._path(name))
+        # The version changes whenever the content of any artifact changes
+        version = hashlib.sha256(''.join(stats[name].sha256 for name in sorted(stats)).encode()).hexdigest()[:16]
+        return ModelBundle(version=version, stats=stats, loaded_at=time.time(), **artifacts)
+
+    def _content_changed(self, signature):
+        # mtime alone is not enough: a retrain may rewrite identical bytes
+        for name, file_sig in signature.items():
+            if self._file_state.get(name) != file_sig:
+                if file_sha256(self._path(name)) != self._bundle.stats[name].sha256:
+                    return True
+        return False
+
+    def get(self):
+        """Return the current bundle, reloading it first if the files changed on disk."""
+        bundle = self._bundle
+        now = time.monotonic()
+        if bundle is not None and now - self._last_check < self.check_interval:
+            return bundle
+
+        with self._lock:
+            if self._bundle is not None and now - self._last_check < self.check_interval:
+                return self._bundle
+            self._last_check = now
+            try:
+                signature = self._stat_signature()
+                if self._bundle is None or self._content_changed(signature):
+                    new_bundle = self._load_bundle()
+                    if self._bundle is not None:
+                        self.reload_count += 1
+                    self._bundle = new_bundle
+                self._file_state = signature
+                self.last_error = None
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError) as exc:
+                # A retrain may still be writing the files: keep serving the old bundle
+                if self._bundle is None:
+                    raise
+                self.last_error = exc
+            return self._bundle
+
+    def report(self):
+        """Per-artifact load time and memory of the current bundle, as plain rows."""
+        bundle = self.get()
+        return [
+            {
+                'artifact': name,
+                'file': stats.path,
+                'size_kb': round(stats.size_bytes / 1024, 1),
+                'load_ms': round(stats.load_seconds * 1000, 2),
+                'memory_kb': round(stats.memory_bytes / 1024, 1),
+                'sha256': stats.sha256[:12],
+            }
+            for name, stats in bundle.stats.items()
+        ]
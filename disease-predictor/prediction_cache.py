@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+# What the cache keeps for one symptom set: the predicted disease and the score of every class
+CachedPrediction = namedtuple('CachedPrediction', ['label', 'scores'])
+
+
+def symptom_bitmask(columns):
+    """Pack a set of symptom column indices into one integer (bit j set for column j)."""
+    mask = 0
+    for column in columns:
+        mask |= 1 << int(column)
+    return mask
+
+
+class PredictionCache:
+    """Bounded LRU cache of predictions shared by every session.
+
+    Keys are symptom bitmasks, so the same symptom set hits the same entry no
+    matter in which order it was selected. Every lookup carries the model version;
+    when it differs from the version the entries were computed with, the whole
+    cache is dropped before the lookup is answered.
+    """
+
+    def __init__(self, capacity=4096):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key, version):
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, version, compute):
+        """Return the cached value, or call ``compute()`` and store its result."""
+        value = self.get(key, version)
+        if value is None:
+            # compute() runs outside the lock so a slow miss does not block other sessions
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
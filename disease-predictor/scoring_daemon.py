@@ -0,0 +1,203 @@
+"""Headless scoring server for the disease model.
+
+Speaks JSON lines over a Unix domain socket or a localhost TCP port. Each request
+line is one object with an optional ``id`` and one of:
+
+    {"id": 1, "symptoms": ["itching", "skin_rash", "nodal_skin_eruptions"]}
+    {"id": 2, "vector": [1, 1, 0, ...]}         # 132 values in training column order
+    {"cmd": "stats"}                            # latency percentiles and batch sizes
+
+and gets back one line such as ``{"id": 1, "prediction": "Fungal infection"}`` or
+``{"id": 1, "error": "..."}``. Requests arriving within ``--max-wait-ms`` of each other
+are scored together in one batched call. When the queue is full new requests are
+answered immediately with ``{"error": "busy"}`` instead of piling up.
+
+    python scoring_daemon.py --port 8765
+    python scoring_daemon.py --socket /tmp/disease.sock
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from model_registry import ModelRegistry
+from svm_engine import SparseRBFEngine
+
+
+class ScoringStats:
+    """Request latency and batch-size counters for the ``stats`` command."""
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.rejected = 0
+
+    def record_batch(self, size, latencies):
+        # Histogram buckets are powers of two: 1, 2, 4, 8, ...
+        self.batch_sizes[1 << (size - 1).bit_length()] += 1
+        self.latencies.extend(latencies)
+        self.requests += size
+
+    def report(self):
+        latencies_ms = np.array(self.latencies) * 1000
+        report = {
+            'requests': self.requests,
+            'rejected': self.rejected,
+            'batch_size_histogram': {f"<={size}": count for size, count in sorted(self.batch_sizes.items())},
+        }
+        if len(latencies_ms):
+            report['latency_ms'] = {
+                'p50': round(float(np.percentile(latencies_ms, 50)), 3),
+                'p99': round(float(np.percentile(latencies_ms, 99)), 3),
+                'max': round(float(latencies_ms.max()), 3),
+            }
+        return report
+
+
+class ScoringDaemon:
+    def __init__(self, registry, max_batch=64, max_wait_ms=5.0, queue_size=1024):
+        self.registry = registry
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = ScoringStats()
+        self._engine = None
+        self._version = None
+
+    def engine(self):
+        # Keep the model warm, but pick up a retrained model between batches
+        bundle = self.registry.get()
+        if bundle.version != self._version:
+            self._engine = SparseRBFEngine.from_bundle(bundle)
+            self.feature_index = {name: i for i, name in enumerate(bundle.scaler.feature_names_in_)}
+            self._version = bundle.version
+        return self._engine
+
+    def parse_vector(self, request):
+        engine = self.engine()
+        if 'vector' in request:
+            vector = np.asarray(request['vector'], dtype=np.float64)
+            if vector.shape != (engine.n_features,) or not np.all((vector == 0) | (vector == 1)):
+                raise ValueError(f"'vector' must hold {engine.n_features} values of 0 or 1")
+            return vector
+        if 'symptoms' in request:
+            symptoms = request['symptoms']
+            if not isinstance(symptoms, list) or not all(isinstance(name, str) for name in symptoms):
+                raise ValueError("'symptoms' must be a list of symptom names")
+            unknown = [name for name in symptoms if name not in self.feature_index]
+            if unknown:
+                raise ValueError(f"Unknown symptom(s): {', '.join(map(str, unknown))}")
+            vector = np.zeros(engine.n_features)
+            vector[[self.feature_index[name] for name in symptoms]] = 1.0
+            return vector
+        raise ValueError("Request needs 'symptoms' or 'vector'")
+
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for one request, then gather whatever else arrives within max_wait
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            engine = self.engine()
+            try:
+                labels = engine.label_for(engine.predict(np.vstack([vector for vector, _, _ in batch])))
+            except Exception as exc:
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+                continue
+            now = time.perf_counter()
+            for (_, future, received), label in zip(batch, labels):
+                future.set_result(str(label))
+            self.stats.record_batch(len(batch), [now - received for _, _, received in batch])
+
+    async def answer(self, request, writer):
+        response = {'id': request.get('id')}
+        try:
+            vector = self.parse_vector(request)
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((vector, future, time.perf_counter()))
+            except asyncio.QueueFull:
+                self.stats.rejected += 1
+                response['error'] = 'busy'
+            else:
+                try:
+                    response['prediction'] = await future
+                except Exception as exc:
+                    # The batch failed as a whole; every request in it still gets its one reply
+                    response['error'] = f"Scoring failed: {exc}"
+        except (TypeError, ValueError) as exc:
+            response['error'] = str(exc)
+        writer.write((json.dumps(response) + '\n').encode())
+
+    async def handle_connection(self, reader, writer):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Each line must be a JSON object")
+                except ValueError as exc:
+                    writer.write((json.dumps({'error': f"Bad request: {exc}"}) + '\n').encode())
+                    continue
+                if request.get('cmd') == 'stats':
+                    writer.write((json.dumps(self.stats.report()) + '\n').encode())
+                    continue
+                # Keep reading while this request waits for its batch; responses carry the id
+                task = asyncio.create_task(self.answer(request, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                await writer.drain()
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    daemon = ScoringDaemon(ModelRegistry(args.directory), args.max_batch, args.max_wait_ms, args.queue_size)
+    daemon.engine()  # load the model before accepting connections
+    if args.socket:
+        server = await asyncio.start_unix_server(daemon.handle_connection, path=args.socket)
+        where = args.socket
+    else:
+        server = await asyncio.start_server(daemon.handle_connection, args.host, args.port)
+        where = f"{args.host}:{args.port}"
+    print(f"Scoring daemon listening on {where}")
+    async with server:
+        await asyncio.gather(server.serve_forever(), daemon.batcher())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching scoring server for the disease model")
+    parser.add_argument('--socket', help="Unix domain socket path (overrides --host/--port)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--directory', default='.', help="Folder holding the model pickles")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--queue-size', type=int, default=1024)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import numpy as np
+
+
+class SparseRBFEngine:
+    """Prediction engine for the RBF ``SVC`` trained on binary symptom vectors.
+
+    The fitted model is taken apart once: support vectors, dual coefficients,
+    intercepts and the ``StandardScaler`` statistics. Because every input column is
+    0 or 1, the scaled input is ``base + sum(step[j] for j in active)`` and the
+    squared distance to each support vector splits into
+
+        ||z - sv||^2 = base_dist + sum(delta[j] for j in active)
+
+    so a patient with k symptoms costs k row additions over the support vectors
+    instead of a dense 132-wide kernel evaluation. Decisions and votes follow the
+    one-vs-one scheme of libsvm, so predictions match ``svm_model.predict``.
+    """
+
+    def __init__(self, svm_model, scaler, label_encoder=None):
+        if svm_model.kernel != 'rbf':
+            raise ValueError(f"SparseRBFEngine needs an RBF kernel, got {svm_model.kernel!r}")
+
+        n_features = svm_model.support_vectors_.shape[1]
+        label_names = None
+        if label_encoder is not None:
+            label_names = label_encoder.inverse_transform(svm_model.classes_)
+        self._setup(
+            support_vectors=svm_model.support_vectors_,
+            mean=scaler.mean_ if scaler.with_mean else np.zeros(n_features),
+            scale=scaler.scale_ if scaler.with_std else np.ones(n_features),
+            gamma=svm_model._gamma,
+            classes=svm_model.classes_,
+            n_support=svm_model.n_support_,
+            dual_coef=svm_model.dual_coef_,
+            intercept=svm_model.intercept_,
+            label_names=label_names,
+        )
+
+    @classmethod
+    def from_arrays(cls, **arrays):
+        """Build an engine from raw model arrays (see ``_setup``) without sklearn objects."""
+        engine = cls.__new__(cls)
+        engine._setup(**arrays)
+        return engine
+
+    def _setup(self, support_vectors, mean, scale, gamma, classes, n_support, dual_coef, intercept,
+               label_names=None, base_dist=None):
+        support_vectors = np.asarray(support_vectors, dtype=np.float64)
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        self.gamma = float(gamma)
+        self.classes = np.asarray(classes)
+        self.n_features = support_vectors.shape[1]
+        self.n_support_vectors = support_vectors.shape[0]
+        n_classes = len(self.classes)
+
+        # Scaled value of a column that is 0, and the jump when it becomes 1
+        base = -mean / scale
+        step = 1.0 / scale
+        diff = base[np.newaxis, :] - support_vectors
+        if base_dist is None:
+            base_dist = np.einsum('ij,ij->i', diff, diff)
+        self.base_dist = np.asarray(base_dist, dtype=np.float64)
+        # delta[j, i]: change in squared distance to support vector i when symptom j is present
+        self.delta = np.ascontiguousarray((step[np.newaxis, :] ** 2 + 2.0 * step[np.newaxis, :] * diff).T)
+
+        # Pairwise weights: column p holds the dual coefficients of classifier (i, j)
+        starts = np.concatenate([[0], np.cumsum(n_support)])
+        dual_coef = np.asarray(dual_coef, dtype=np.float64)
+        n_pairs = n_classes * (n_classes - 1) // 2
+        self.pair_weights = np.zeros((self.n_support_vectors, n_pairs))
+        self.pair_first = np.empty(n_pairs, dtype=np.intp)
+        self.pair_second = np.empty(n_pairs, dtype=np.intp)
+        p = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                self.pair_weights[starts[i]:starts[i + 1], p] = dual_coef[j - 1, starts[i]:starts[i + 1]]
+                self.pair_weights[starts[j]:starts[j + 1], p] = dual_coef[i, starts[j]:starts[j + 1]]
+                self.pair_first[p], self.pair_second[p] = i, j
+                p += 1
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+
+        # One-hot maps from pairs to classes, used to count votes for a whole batch at once
+        self.first_onehot = np.zeros((n_pairs, n_classes))
+        self.first_onehot[np.arange(n_pairs), self.pair_first] = 1.0
+        self.second_onehot = np.zeros((n_pairs, n_classes))
+        self.second_onehot[np.arange(n_pairs), self.pair_second] = 1.0
+
+        # Human-readable disease names in the order of self.classes
+        self.label_names = None if label_names is None else np.asarray(label_names)
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls(bundle.svm_model, bundle.scaler, bundle.label_encoder)
+
+    # Squared distances to the support vectors
+
+    def distances_from_indices(self, active):
+        active = np.asarray(active, dtype=np.intp)
+        return self.base_dist + self.delta[active].sum(axis=0)
+
+    def distances(self, X):
+        X = self._check_binary(X)
+        return self.base_dist + X @ self.delta
+
+    # Decisions from squared distances
+
+    def pair_decisions(self, dist):
+        """One-vs-one decision values, shape (n_samples, n_pairs)."""
+        kernel = np.exp(-self.gamma * np.atleast_2d(dist))
+        return kernel @ self.pair_weights + self.intercept
+
+    def votes(self, dec):
+        # libsvm gives the vote to the first class of the pair when the decision is positive
+        wins_first = (dec > 0).astype(np.float64)
+        return wins_first @ self.first_onehot + (1.0 - wins_first) @ self.second_onehot
+
+    def scores(self, dec):
+        """Votes plus bounded confidence, the same as ``decision_function`` with ``shape='ovr'``."""
+        confidence = dec @ (self.first_onehot - self.second_onehot)
+        return self.votes(dec) + confidence / (3.0 * (np.abs(confidence) + 1.0))
+
+    def rank(self, scores, k=5):
+        """The k best classes for one row of ``scores`` as (class, votes, score) tuples."""
+        # The confidence part of a score is below 1/3, so rounding recovers the vote count
+        votes = np.rint(scores)
+        # Sort by votes first, lowest class index on ties, so the leader is what predict() returns
+        order = np.lexsort((np.arange(len(votes)), -votes))[:k]
+        return [(self.classes[i], int(votes[i]), float(scores[i])) for i in order]
+
+    def predict_from_distances(self, dist):
+        # argmax keeps the lowest class index on ties, like libsvm
+        return self.classes[np.argmax(self.votes(self.pair_decisions(dist)), axis=1)]
+
+    # Public prediction API
+
+    def predict_indices(self, active):
+        """Predict one patient given the column indices of the present symptoms."""
+        return self.predict_from_distances(self.distances_from_indices(active))[0]
+
+    def predict(self, X):
+        """Predict a batch of 0/1 symptom rows with a single matrix product."""
+        return self.predict_from_distances(self.distances(X))
+
+    def decision_function(self, X):
+        return self.scores(self.pair_decisions(self.distances(X)))
+
+    def label_for(self, class_value):
+        if self.label_names is None:
+            return class_value
+        return self.label_names[np.searchsorted(self.classes, class_value)]
+
+    def _check_binary(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} symptom columns, got {X.shape[1]}")
+        if not np.all((X == 0) | (X == 1)):
+            raise ValueError("SparseRBFEngine only accepts 0/1 symptom values")
+        return X
+
+
+class SymptomSession:
+    """Per-session squared distances that follow the symptom selection one toggle at a time.
+
+    Adding or removing symptom ``j`` only shifts the distances by ``engine.delta[j]``,
+    so a toggle costs O(n_support_vectors) instead of a full kernel recomputation.
+    The distances are recomputed from scratch every ``resync_every`` toggles so that
+    rounding errors cannot build up over a long session.
+    """
+
+    def __init__(self, engine, resync_every=64):
+        self.engine = engine
+        self.resync_every = resync_every
+        self.active = set()
+        self.dist = engine.base_dist.copy()
+        self._toggles = 0
+
+    def add(self, column):
+        if column not in self.active:
+            self.active.add(column)
+            self.dist += self.engine.delta[column]
+            self._count_toggle()
+
+    def remove(self, column):
+        if column in self.active:
+            self.active.discard(column)
+            self.dist -= self.engine.delta[column]
+            self._count_toggle()
+
+    def sync(self, columns):
+        """Move to a new selection by toggling only the columns that changed."""
+        columns = set(columns)
+        for column in self.active - columns:
+            self.remove(column)
+        for column in columns - self.active:
+            self.add(column)
+
+    def _count_toggle(self):
+        self._toggles += 1
+        if self._toggles >= self.resync_every:
+            self.dist = self.engine.distances_from_indices(sorted(self.active))
+            self._toggles = 0
+
+    def predict(self):
+        return self.engine.predict_from_distances(self.dist)[0]
+
+    def scores(self):
+        """Scores of every class for the current selection (see ``SparseRBFEngine.scores``)."""
+        return self.engine.scores(self.engine.pair_decisions(self.dist))[0]
+
+    def top_k(self, k=5):
+        return self.engine.rank(self.scores(), k)
+
+
+if __name__ == '__main__':
+    # Check the engine against sklearn on Testing.csv and compare per-call latency
+    import time
+    import pandas as pd
+    from model_registry import ModelRegistry
+
+    bundle = ModelRegistry().get()
+    engine = SparseRBFEngine.from_bundle(bundle)
+    test_data = pd.read_csv('Testing.csv')
+    X_test = test_data.drop(columns=['prognosis'])
+
+    expected = bundle.svm_model.predict(bundle.scaler.transform(X_test))
+    batch = engine.predict(X_test.to_numpy())
+    single = np.array([engine.predict_indices(np.flatnonzero(row)) for row in X_test.to_numpy()])
+    print(f"Batch predictions match sklearn: {np.array_equal(batch, expected)}")
+    print(f"Single predictions match sklearn: {np.array_equal(single, expected)}")
+
+    row = X_test.iloc[[0]]
+    active = np.flatnonzero(row.to_numpy()[0])
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        bundle.svm_model.predict(bundle.scaler.transform(row))
+    sklearn_us = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats):
+        engine.predict_indices(active)
+    engine_us = (time.perf_counter() - start) / repeats * 1e6
+    print(f"Per call: sklearn {sklearn_us:.0f} us, engine {engine_us:.0f} us ({sklearn_us / engine_us:.1f}x)")
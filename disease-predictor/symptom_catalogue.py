@@ -0,0 +1,77 @@
+import html
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+# Styles of the catalogue; the component runs in an iframe, so it cannot use the app's CSS
+CATALOGUE_CSS = """
+body { margin: 0; font-family: 'Arial', sans-serif; }
+#symptom-search {
+    width: 100%; box-sizing: border-box; padding: 8px 10px; margin-bottom: 6px;
+    border: 1px solid #ddd; border-radius: 10px; font-size: 14px;
+}
+#symptom-count { font-size: 12px; color: #666; margin: 0 0 6px 4px; }
+.symptom-grid { display: grid; grid-template-columns: repeat(3, 1fr); }
+.symptom-col {
+    font-size: 14px;
+    color: #333;
+    background-color: #fff;
+    border: 1px solid #ddd;
+    padding: 10px;
+    margin: 5px;
+    border-radius: 10px;
+}
+"""
+
+# Case-insensitive substring match, the same way the multiselect search box filters its options
+CATALOGUE_JS = """
+const search = document.getElementById('symptom-search');
+const count = document.getElementById('symptom-count');
+const items = Array.from(document.querySelectorAll('.symptom-col'));
+function applyFilter() {
+    const query = search.value.trim().toLowerCase();
+    let shown = 0;
+    for (const item of items) {
+        const match = item.dataset.name.includes(query);
+        item.style.display = match ? '' : 'none';
+        shown += match;
+    }
+    count.textContent = shown + ' of ' + items.length + ' symptoms';
+}
+search.addEventListener('input', applyFilter);
+applyFilter();
+"""
+
+
+def catalogue_html(symptom_names):
+    """One self-contained HTML document listing every symptom with a search box.
+
+    The browser does the filtering, so the app sends this payload once per rerun as
+    a single element instead of one markdown element per symptom.
+    """
+    items = ''.join(
+        f"<div class='symptom-col' data-name=\"{html.escape(name.lower())}\">{html.escape(name)}</div>"
+        for name in symptom_names
+    )
+    return (
+        f"<style>{CATALOGUE_CSS}</style>"
+        "<input id='symptom-search' type='search' placeholder='Filter symptoms...'>"
+        "<div id='symptom-count'></div>"
+        f"<div class='symptom-grid'>{items}</div>"
+        f"<script>{CATALOGUE_JS}</script>"
+    )
+
+
+@st.cache_data
+def cached_catalogue_html(symptom_names):
+    return catalogue_html(symptom_names)
+
+
+def show_catalogue(symptom_names, height=420):
+    """Render the catalogue as one element; the HTML is built once per symptom list."""
+    payload = cached_catalogue_html(tuple(symptom_names))
+    # Newer Streamlit releases replace components.html with st.iframe
+    if hasattr(st, 'iframe'):
+        st.iframe(payload, height=height)
+    else:
+        components.html(payload, height=height, scrolling=True)
@@ -0,0 +1,197 @@
+"""Typo-tolerant symptom lookup built from the training header and a synonyms file.
+
+Every searchable term (the display name of each column plus its synonyms) is
+normalised to lowercase words and indexed three ways:
+
+* a sorted array of whole terms, for "starts with" matches,
+* a sorted array of the individual words, for matches on the start of any word,
+* trigram posting lists, for misspellings ("diarhea", "brethlessness").
+
+A query scores every term with vectorised NumPy operations over those
+structures, keeps the best term per column and returns the top columns, so a
+lookup stays well under a millisecond even with a 10k-term vocabulary.
+"""
+import csv
+import re
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+# One search result: the canonical column index and the term that matched
+SymptomMatch = namedtuple('SymptomMatch', ['column', 'display_name', 'term', 'score'])
+
+SYNONYMS_FILE = 'symptom_synonyms.csv'
+
+# Score bands: whole-term prefix > word prefix > trigram similarity (0..1)
+EXACT_SCORE = 4.0
+PREFIX_SCORE = 3.0
+WORD_PREFIX_SCORE = 2.0
+
+
+def normalize(text):
+    """Lowercase words separated by single spaces; underscores and punctuation become spaces."""
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', str(text).lower()).split())
+
+
+def display_name_for(column):
+    # pandas renames repeated headers to "name.1"; the synonyms file gives those a proper name
+    return ' '.join(re.sub(r'\.\d+$', '', column).replace('_', ' ').split())
+
+
+def trigrams(term):
+    """Trigrams of each word, padded like pg_trgm ("  wo", " wor", ..., "rd ")."""
+    grams = set()
+    for word in term.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def read_synonyms(path):
+    """Map column name -> (display name or None, [synonyms]) from the synonyms CSV."""
+    entries = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            synonyms = [s.strip() for s in (row.get('synonyms') or '').split(';') if s.strip()]
+            entries[row['column']] = ((row.get('display_name') or '').strip() or None, synonyms)
+    return entries
+
+
+class SymptomIndex:
+    def __init__(self, feature_names, synonyms=None):
+        synonyms = synonyms or {}
+        self.feature_names = list(feature_names)
+        self.display_names = []
+        terms, term_columns = [], []
+        for column, name in enumerate(self.feature_names):
+            display, extra = synonyms.get(name, (None, []))
+            display = display or display_name_for(name)
+            self.display_names.append(display)
+            for term in dict.fromkeys([display, display_name_for(name)] + extra):
+                terms.append(normalize(term))
+                term_columns.append(column)
+        if len(set(self.display_names)) != len(self.display_names):
+            raise ValueError("Symptom display names must be unique; add display_name entries to the synonyms file")
+        self.column_of = {display: column for column, display in enumerate(self.display_names)}
+
+        self.terms = np.array(terms)
+        self.term_columns = np.array(term_columns, dtype=np.intp)
+
+        # Whole terms, sorted, for prefix ranges
+        self._term_order = np.argsort(self.terms, kind='stable')
+        self._sorted_terms = self.terms[self._term_order]
+
+        # Words of every term, sorted, for word-prefix ranges
+        words, word_terms = [], []
+        for term_id, term in enumerate(terms):
+            for word in term.split():
+                words.append(word)
+                word_terms.append(term_id)
+        order = np.argsort(np.array(words), kind='stable')
+        self._sorted_words = np.array(words)[order]
+        self._word_terms = np.array(word_terms, dtype=np.intp)[order]
+        self._term_word_counts = np.array([len(term.split()) for term in terms])
+
+        # Trigram posting lists
+        postings = defaultdict(list)
+        self._term_trigram_counts = np.zeros(len(terms))
+        for term_id, term in enumerate(terms):
+            grams = trigrams(term)
+            self._term_trigram_counts[term_id] = len(grams)
+            for gram in grams:
+                postings[gram].append(term_id)
+        self._postings = {gram: np.array(ids, dtype=np.intp) for gram, ids in postings.items()}
+
+    @classmethod
+    def from_feature_names(cls, feature_names, synonyms_path=SYNONYMS_FILE):
+        return cls(feature_names, read_synonyms(synonyms_path) if synonyms_path else None)
+
+    @classmethod
+    def from_csv_header(cls, csv_path='data.csv', synonyms_path=SYNONYMS_FILE, label_column='prognosis'):
+        import pandas as pd
+        columns = [c for c in pd.read_csv(csv_path, nrows=0).columns if c != label_column]
+        return cls.from_feature_names(columns, synonyms_path)
+
+    def _prefix_range(self, sorted_values, prefix):
+        # Every string starting with prefix sorts between prefix and prefix + U+10FFFF
+        lo = np.searchsorted(sorted_values, prefix, side='left')
+        hi = np.searchsorted(sorted_values, prefix + '\U0010ffff', side='left')
+        return lo, hi
+
+    def term_scores(self, query):
+        """Score of every indexed term for ``query`` (0 means no match)."""
+        query = normalize(query)
+        scores = np.zeros(len(self.terms))
+        if not query:
+            return scores
+
+        # Typos: trigram Jaccard similarity, accumulated from the posting lists
+        grams = trigrams(query)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if hits:
+            shared = np.bincount(np.concatenate(hits), minlength=len(self.terms))
+            scores = shared / (len(grams) + self._term_trigram_counts - shared)
+
+        # Every query word is the start of some word of the term ("short breath")
+        words = query.split()
+        matched = None
+        for word in words:
+            lo, hi = self._prefix_range(self._sorted_words, word)
+            ids = np.unique(self._word_terms[lo:hi])
+            matched = ids if matched is None else np.intersect1d(matched, ids, assume_unique=True)
+        if matched is not None and len(matched):
+            coverage = len(words) / self._term_word_counts[matched]
+            scores[matched] = np.maximum(scores[matched], WORD_PREFIX_SCORE + coverage)
+
+        # The whole term starts with the query, or is the query
+        lo, hi = self._prefix_range(self._sorted_terms, query)
+        prefix_ids = self._term_order[lo:hi]
+        scores[prefix_ids] = PREFIX_SCORE + len(query) / np.char.str_len(self.terms[prefix_ids])
+        scores[prefix_ids[self.terms[prefix_ids] == query]] = EXACT_SCORE
+        return scores
+
+    def search(self, query, limit=8, min_score=0.3):
+        """Best matching columns for ``query``, one result per column, best first."""
+        scores = self.term_scores(query)
+        candidates = np.flatnonzero(scores >= min_score)
+        if not len(candidates):
+            return []
+        # Keep the best term of each column
+        order = candidates[np.lexsort((-scores[candidates], self.term_columns[candidates]))]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = self.term_columns[order[1:]] != self.term_columns[order[:-1]]
+        best = order[first]
+        best = best[np.argsort(-scores[best], kind='stable')][:limit]
+        return [
+            SymptomMatch(int(self.term_columns[t]), self.display_names[self.term_columns[t]], str(self.terms[t]),
+                         float(scores[t]))
+            for t in best
+        ]
+
+
+if __name__ == '__main__':
+    # Per-keystroke latency on the real vocabulary and on a synthetic 10k-term one
+    import time
+
+    def time_queries(index, queries, repeats=20):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for query in queries:
+                index.search(query)
+        return (time.perf_counter() - start) / (repeats * len(queries)) * 1e6
+
+    keystrokes = [typed[:i] for typed in ['breathlesness', 'diarhea', 'spotting urin', 'cold hands', 'fevr'] for i in
+                  range(1, len(typed) + 1)]
+    index = SymptomIndex.from_csv_header()
+    for query in ['diarhea', 'spotting urination', 'cold hands and feet', 'short breath', 'scaring']:
+        print(f"{query!r:>22} -> {[m.display_name for m in index.search(query, limit=3)]}")
+    print(f"{len(index.terms)} terms: {time_queries(index, keystrokes):.0f} us per keystroke")
+
+    rng = np.random.default_rng(0)
+    syllables = ['ab', 'ul', 'cer', 'ton', 'gia', 'pha', 'ryn', 'gi', 'tis', 'neu', 'ro', 'pa', 'thy', 'os', 'te',
+                 'al', 'myo', 'car', 'di', 'um', 'hem', 'or', 'rha', 'ge', 'lym', 'ph', 'ede', 'ma']
+    vocabulary = [' '.join(''.join(rng.choice(syllables, rng.integers(2, 5))) for _ in range(rng.integers(1, 4)))
+                  for _ in range(10000)]
+    large = SymptomIndex([f"term_{i}" for i in range(len(vocabulary))],
+                         {f"term_{i}": (f"{term} {i}", []) for i, term in enumerate(vocabulary)})
+    print(f"{len(large.terms)} terms: {time_queries(large, keystrokes + vocabulary[:20], repeats=5):.0f} us per keystroke")
@@ -0,0 +1,206 @@
+"""Decision-tree inference without sklearn for the trait quiz.
+
+``decision_tree_model.pkl`` holds a ``DecisionTreeClassifier`` trained on
+data.csv (see Final.ipynb), with the text columns label encoded. The compiled
+form flattens the fitted tree into contiguous arrays: the feature and threshold
+of each node, its two children, and the class probabilities at each leaf.
+Leaves point to themselves, so a batch is evaluated with ``max_depth`` rounds of
+array indexing. A single prediction is a short loop over Python lists and
+takes a few microseconds.
+
+The artifact also keeps what is needed to build a feature vector from the quiz:
+the label encoding of every text column (sorted values, like ``LabelEncoder``)
+and a default value per feature (the median or most common value in data.csv)
+for the questions the quiz does not ask.
+
+    python compiled_tree.py           # export decision_tree_compiled.npz and check parity with the pickle
+"""
+import json
+
+import numpy as np
+
+COMPILED_FILE = 'decision_tree_compiled.npz'
+FORMAT_VERSION = 1
+
+# A quiz answer sets the trait to the top of data.csv's 1-5 scale when it is the
+# recommended option, and to the low end otherwise
+CORRECT_LEVEL = 5
+OTHER_LEVEL = 2
+
+
+class CompiledTree:
+    def __init__(self, feature, threshold, left, right, value, classes, feature_names, categories=None,
+                 defaults=None, max_depth=None):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        self.feature_names = list(feature_names)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self.categories = categories or {}
+        self.defaults = defaults or {}
+        self.max_depth = int(max_depth if max_depth is not None else len(self.feature))
+        # Python lists for the single-row path; list indexing beats NumPy scalar access.
+        # A float32 feature is <= a threshold t exactly when it is <= the largest float32
+        # not above t, so the thresholds are rounded down to float32 once and the
+        # features compare as plain floats
+        threshold32 = self.threshold.astype(np.float32)
+        threshold32 = np.where(threshold32 > self.threshold, np.nextafter(threshold32, np.float32(-np.inf)),
+                               threshold32)
+        self._nodes = list(zip(self.feature.tolist(), threshold32.astype(np.float64).tolist(), self.left.tolist(),
+                               self.right.tolist()))
+        self._leaf_class = self.classes[self.value.argmax(axis=1)].tolist()
+
+    @classmethod
+    def from_sklearn(cls, model, feature_names=None, categories=None, defaults=None):
+        tree = model.tree_
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left < 0
+        # Leaves loop back to themselves and always go "left"
+        feature = np.where(is_leaf, 0, tree.feature)
+        threshold = np.where(is_leaf, np.inf, tree.threshold)
+        left = np.where(is_leaf, nodes, tree.children_left)
+        right = np.where(is_leaf, nodes, tree.children_right)
+        value = tree.value[:, 0, :]
+        value = value / value.sum(axis=1, keepdims=True)
+        names = feature_names if feature_names is not None else list(model.feature_names_in_)
+        return cls(feature, threshold, left, right, value, model.classes_, names, categories, defaults,
+                   tree.max_depth)
+
+    def _as_float32(self, X):
+        # sklearn compares float32 features with float64 thresholds
+        return np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    def apply(self, X):
+        """Leaf index of every row of ``X`` (rows of encoded features)."""
+        X = self._as_float32(X)
+        rows = np.arange(len(X))
+        node = np.zeros(len(X), dtype=np.int32)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict(self, X):
+        return self.classes[self.value[self.apply(X)].argmax(axis=1)]
+
+    def predict_proba(self, X):
+        return self.value[self.apply(X)]
+
+    def predict_one(self, x):
+        """Class of one encoded feature vector of values exact in float32 (the quiz's small integers).
+
+        A plain Python loop over lists; no NumPy call per node.
+        """
+        node = 0
+        nodes = self._nodes
+        while True:
+            feature, threshold, left, right = nodes[node]
+            if left == node:
+                return self._leaf_class[node]
+            node = left if x[feature] <= threshold else right
+
+    def encode(self, values):
+        """Encoded feature vector from raw values by feature name; missing features take their defaults.
+
+        Text values are label encoded with the categories seen in training.
+        """
+        vector = []
+        for name in self.feature_names:
+            value = values.get(name, self.defaults.get(name))
+            if name in self.categories:
+                value = self.categories[name].index(value)
+            vector.append(value)
+        return vector
+
+    def save(self, path=COMPILED_FILE):
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'feature_names': self.feature_names,
+            'categories': self.categories,
+            'defaults': self.defaults,
+            'max_depth': self.max_depth,
+        }
+        np.savez_compressed(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                            right=self.right, value=self.value, classes=self.classes, meta=np.array(json.dumps(meta)))
+
+
+def load_compiled(path=COMPILED_FILE):
+    with np.load(path, allow_pickle=False) as arrays:
+        meta = json.loads(str(arrays['meta']))
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled tree version {meta['format_version']}")
+        return CompiledTree(arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+                            arrays['value'], arrays['classes'], meta['feature_names'], meta['categories'],
+                            meta['defaults'], meta['max_depth'])
+
+
+def quiz_features(tree, trait_answers, profile=None):
+    """Raw feature values for the model from the quiz.
+
+    ``trait_answers`` maps a trait (a feature name such as 'Perseverance') to
+    whether the recommended option was chosen; ``profile`` holds any other
+    features the user filled in.
+    """
+    values = dict(profile or {})
+    for trait, correct in trait_answers.items():
+        if trait in tree.feature_index:
+            values[trait] = CORRECT_LEVEL if correct else OTHER_LEVEL
+    return values
+
+
+def training_metadata(data, feature_names):
+    """Label encodings and default values of the features, from the training data."""
+    categories, defaults = {}, {}
+    for name in feature_names:
+        column = data[name]
+        if column.dtype.kind in 'if':
+            defaults[name] = float(column.median())
+        else:
+            categories[name] = sorted(str(value) for value in column.dropna().unique())
+            defaults[name] = str(column.mode().iloc[0])
+    return categories, defaults
+
+
+if __name__ == '__main__':
+    # Export from the pickle and check that every prediction agrees
+    import pickle
+    import time
+    import pandas as pd
+
+    with open('decision_tree_model.pkl', 'rb') as file:
+        model, feature_names = pickle.load(file)
+    data = pd.read_csv('data.csv')
+    categories, defaults = training_metadata(data, feature_names)
+    CompiledTree.from_sklearn(model, feature_names, categories, defaults).save()
+    tree = load_compiled()
+
+    encoded = np.array([tree.encode(row) for row in data[feature_names].to_dict('records')], dtype=np.float64)
+    frame = pd.DataFrame(encoded, columns=feature_names)
+    rng = np.random.default_rng(0)
+    low, high = encoded.min(axis=0), encoded.max(axis=0)
+    random_rows = rng.integers(low.astype(int), high.astype(int) + 1, size=(200_000, len(feature_names)))
+    random_frame = pd.DataFrame(random_rows, columns=feature_names)
+    print(f"data.csv: {np.sum(tree.predict(encoded) != model.predict(frame))} mismatches of {len(encoded)}; "
+          f"random rows: {np.sum(tree.predict(random_rows) != model.predict(random_frame))} of {len(random_rows)}")
+    single = sum(tree.predict_one(row) != expected for row, expected in
+                 zip(random_rows[:20000].tolist(), model.predict(random_frame[:20000])))
+    print(f"Single-row path: {single} mismatches of 20000")
+    print(f"Probabilities max difference: "
+          f"{np.abs(tree.predict_proba(random_rows) - model.predict_proba(random_frame)).max():.1e}")
+
+    rows = random_rows[:1000].tolist()
+    start = time.perf_counter()
+    for row in rows:
+        tree.predict_one(row)
+    single_us = (time.perf_counter() - start) / len(rows) * 1e6
+    start = time.perf_counter()
+    for row in rows[:100]:
+        model.predict(pd.DataFrame([row], columns=feature_names))
+    sklearn_us = (time.perf_counter() - start) / 100 * 1e6
+    start = time.perf_counter()
+    tree.predict(random_rows)
+    batch_ns = (time.perf_counter() - start) / len(random_rows) * 1e9
+    print(f"Single prediction {single_us:.1f} us (sklearn {sklearn_us:.0f} us); batch {batch_ns:.0f} ns per row")
@@ -0,0 +1,94 @@
+"""Compact quiz state per session, and accounting of what the sessions hold.
+
+A session keeps only ``((trait, scenario id, chosen option), ...)``: one
+triple of small ints per question. The text of the scenarios, options and
+feedback lives once per process in the shared ``ScenarioBank`` and is looked up
+when a page is drawn.
+
+``SessionLedger`` is shared by all sessions of the process (the app keeps it in
+``st.cache_resource``). Every rerun records the size of its session state, so
+the app can show the bytes of one session and the total over the sessions seen
+recently.
+
+    python quiz_session.py            # per-session bytes: compact state vs full scenario dicts
+"""
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+
+LIVE_SECONDS = 30 * 60
+
+LedgerTotals = namedtuple('LedgerTotals', ['sessions', 'total_bytes', 'largest_bytes'])
+
+
+def new_quiz(bank, rng=random):
+    """One random scenario per trait, every answer on the first option."""
+    return tuple((trait, scenario_id, 0) for trait, scenario_id in bank.pick(rng))
+
+
+def with_answers(quiz, options):
+    """The same questions with the chosen option indexes replaced."""
+    return tuple((trait, scenario_id, int(option)) for (trait, scenario_id, _), option in zip(quiz, options))
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes of ``obj`` and everything it references, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def scenario_dicts(bank, quiz):
+    """The quiz as the app used to keep it: a full dict of text, options and feedback per question."""
+    dicts = []
+    for trait, scenario_id, _ in quiz:
+        scenario = bank.get(trait, scenario_id)
+        dicts.append({
+            'scenario': str(scenario.text),
+            'options': [str(option) for option in scenario.options],
+            'correct_option': scenario.correct_option + 1,
+            'feedback': {i + 1: str(message) for i, message in enumerate(scenario.feedback)},
+        })
+    return dicts
+
+
+class SessionLedger:
+    """Size of the session state of every session, as last reported by its reruns."""
+
+    def __init__(self, live_seconds=LIVE_SECONDS):
+        self.live_seconds = live_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id, nbytes):
+        with self._lock:
+            self._sessions[session_id] = (nbytes, time.monotonic())
+
+    def totals(self):
+        """Sessions seen within ``live_seconds``; older entries are dropped."""
+        cutoff = time.monotonic() - self.live_seconds
+        with self._lock:
+            self._sessions = {key: entry for key, entry in self._sessions.items() if entry[1] >= cutoff}
+            sizes = [nbytes for nbytes, _ in self._sessions.values()]
+        return LedgerTotals(len(sizes), sum(sizes), max(sizes, default=0))
+
+
+if __name__ == '__main__':
+    from scenario_bank import load_bank
+
+    bank = load_bank()
+    quiz = with_answers(new_quiz(bank, random.Random(0)), [1, 2, 0, 3, 1])
+    compact = deep_sizeof(quiz)
+    full = deep_sizeof(scenario_dicts(bank, quiz))
+    print(f"Per session: compact state {compact} bytes, full scenario dicts {full} bytes ({full / compact:.0f}x)")
+    for sessions in [1_000, 10_000]:
+        print(f"{sessions:>6,} sessions: {sessions * compact / 2**20:.1f} MB vs {sessions * full / 2**20:.1f} MB")
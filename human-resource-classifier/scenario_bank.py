@@ -0,0 +1,101 @@
+"""The quiz scenarios, loaded from scenarios.json and indexed once per process.
+
+scenarios.json maps each trait to its list of scenarios. A scenario has an
+``id`` (unique within its trait), the ``scenario`` text, its ``options``, the
+1-based ``correct_option`` and ``feedback`` keyed by 1-based option number.
+
+Loading checks every entry and builds the lookups the app needs at each rerun:
+the scenarios of a trait by position and by id, and for each scenario an
+option-text to index map and a feedback tuple aligned with the options. None
+of these lookups depends on how many scenarios a trait has.
+
+    python scenario_bank.py           # validate scenarios.json and print a summary
+"""
+import json
+import random
+from collections import namedtuple
+
+SCENARIO_FILE = 'scenarios.json'
+NO_FEEDBACK = "No feedback available."
+
+# correct_option is 0-based here, like the option indexes and the feedback tuple
+Scenario = namedtuple('Scenario', ['id', 'text', 'options', 'correct_option', 'feedback', 'option_index'])
+
+
+class ScenarioBank:
+    def __init__(self, traits):
+        """``traits`` maps trait name -> list of validated Scenario tuples, in quiz order."""
+        self.traits = list(traits)
+        self.scenarios = [tuple(traits[trait]) for trait in self.traits]
+        self.trait_index = {trait: i for i, trait in enumerate(self.traits)}
+        self.position_of = [{scenario.id: position for position, scenario in enumerate(scenarios)}
+                            for scenarios in self.scenarios]
+
+    def __len__(self):
+        return sum(len(scenarios) for scenarios in self.scenarios)
+
+    def get(self, trait, scenario_id):
+        """Scenario by trait (name or index) and scenario id."""
+        t = self.trait_index[trait] if isinstance(trait, str) else trait
+        return self.scenarios[t][self.position_of[t][scenario_id]]
+
+    def pick(self, rng=random):
+        """One random scenario per trait, as (trait index, scenario id) pairs."""
+        return [(t, rng.choice(scenarios).id) for t, scenarios in enumerate(self.scenarios)]
+
+
+def _parse_scenario(trait, position, entry):
+    where = f"{trait}[{position}]"
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}: a scenario must be an object")
+    missing = {'id', 'scenario', 'options', 'correct_option'} - set(entry)
+    if missing:
+        raise ValueError(f"{where}: missing {sorted(missing)}")
+    # bool is a subclass of int, but true/false are not ids
+    if not isinstance(entry['id'], int) or isinstance(entry['id'], bool):
+        raise ValueError(f"{where}: id must be an integer")
+    where = f"{trait} scenario {entry['id']}"
+    text = entry['scenario']
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError(f"{where}: empty scenario text")
+    options = entry['options']
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, str) and o for o in options):
+        raise ValueError(f"{where}: options must be a list of at least two non-empty strings")
+    if len(set(options)) != len(options):
+        raise ValueError(f"{where}: options must be distinct")
+    correct = entry['correct_option']
+    if not isinstance(correct, int) or isinstance(correct, bool) or not 1 <= correct <= len(options):
+        raise ValueError(f"{where}: correct_option must be between 1 and {len(options)}")
+    feedback = [NO_FEEDBACK] * len(options)
+    for key, message in (entry.get('feedback') or {}).items():
+        if not str(key).isdigit() or not 1 <= int(key) <= len(options):
+            raise ValueError(f"{where}: feedback for unknown option {key!r}")
+        feedback[int(key) - 1] = str(message)
+    return Scenario(entry['id'], text, tuple(options), correct - 1, tuple(feedback),
+                    {option: i for i, option in enumerate(options)})
+
+
+def load_bank(path=SCENARIO_FILE):
+    """Read and validate the scenario file; raises ValueError naming the first bad entry."""
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    traits = document.get('traits') if isinstance(document, dict) else None
+    if not isinstance(traits, dict) or not traits:
+        raise ValueError(f"{path}: expected {{\"traits\": {{trait: [scenarios]}}}}")
+    parsed = {}
+    for trait, entries in traits.items():
+        if not isinstance(entries, list) or not entries:
+            raise ValueError(f"{trait}: needs at least one scenario")
+        scenarios = [_parse_scenario(trait, position, entry) for position, entry in enumerate(entries)]
+        ids = [scenario.id for scenario in scenarios]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"{trait}: duplicate scenario ids")
+        parsed[trait] = scenarios
+    return ScenarioBank(parsed)
+
+
+if __name__ == '__main__':
+    bank = load_bank()
+    print(f"{len(bank)} scenarios")
+    for trait, scenarios in zip(bank.traits, bank.scenarios):
+        print(f"  {trait}: {len(scenarios)}")